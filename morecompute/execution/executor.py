@@ -143,7 +143,7 @@ class NextZmqExecutor:
                     # Execute pure special command locally
                     execution_count = getattr(self, 'execution_count', 0) + 1
                     self.execution_count = execution_count
-                    start_time = time.time()
+                    start_time = time.perf_counter()
                     result: dict[str, object] = {
                         'outputs': [],
                         'error': None,
@@ -156,7 +156,7 @@ class NextZmqExecutor:
                     result = await handler.execute_special_command(
                         normalized_source, result, start_time, execution_count, websocket, cell_index
                     )
-                    result['execution_time'] = f"{(time.time()-start_time)*1000:.1f}ms"
+                    result['execution_time'] = f"{(time.perf_counter()-start_time)*1000:.1f}ms"
                     if websocket:
                         await websocket.send_json({'type': 'execution_complete', 'data': {'cell_index': cell_index, 'result': result}})
                     return result
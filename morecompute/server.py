@@ -32,6 +32,7 @@ from .services.providers import (
     get_active_provider,
     set_active_provider,
     refresh_provider,
+    close_all_providers,
     BaseGPUProvider,
 )
 from .models.api_models import (
@@ -140,6 +141,9 @@ async def shutdown_event():
         except Exception:
             pass
 
+    # Close pooled provider HTTP connections
+    await close_all_providers()
+
 
 @app.get("/api/packages")
 async def list_installed_packages(force_refresh: bool = False):
@@ -267,19 +271,46 @@ async def get_environments(full: bool = True, force_refresh: bool = False):
     Return available Python environments.
     Args:
         full: If True (default), performs comprehensive scan (conda, system, venv).
-              Takes a few seconds but finds all environments.
+              Takes a few seconds but finds all environments. If False, returns
+              the current interpreter right away (or a cached full scan) and
+              runs the full scan in the background to warm the cache.
         force_refresh: If True, bypass cache and fetch fresh data
     """
-    cache_key = f"environments_{full}"
+    cache_key = "environments"
 
-    # Check cache first unless force refresh is requested
+    # Check cache first unless force refresh is requested; a cached full
+    # scan also answers fast requests
     if not force_refresh and cache_key in environments_cache:
         return environments_cache[cache_key]
 
     try:
         detector = PythonEnvironmentDetector()
-        environments = detector.detect_all_environments()
         current_env = detector.get_current_environment()
+        loop = asyncio.get_running_loop()
+
+        if not full:
+            def _cache_full_scan(environments: list[dict]) -> None:
+                # Called from the detector's background thread
+                try:
+                    loop.call_soon_threadsafe(environments_cache.__setitem__, cache_key, {
+                        "status": "success",
+                        "environments": environments,
+                        "current": current_env
+                    })
+                except RuntimeError:
+                    pass  # Event loop closed (server shutting down) before the scan finished
+
+            return {
+                "status": "success",
+                "environments": detector.detect_fast_environments(callback=_cache_full_scan),
+                "current": current_env
+            }
+
+        # Scanning blocks on file reads and interpreter subprocesses; keep it
+        # off the event loop so other requests aren't stalled meanwhile
+        environments = await loop.run_in_executor(
+            None, lambda: detector.detect_all_environments(refresh=force_refresh)
+        )
 
         result = {
             "status": "success",
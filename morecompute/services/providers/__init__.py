@@ -38,7 +38,9 @@ from .base_provider import (
     ProviderInfo,
     ProviderType,
     GpuAvailability,
+    GpuOffer,
     NormalizedPod,
+    PodSummary,
 )
 
 # Factory functions
@@ -53,6 +55,7 @@ from .provider_factory import (
     set_active_provider,
     get_active_provider,
     configure_provider,
+    close_all_providers,
     clear_all_providers,
 )
 
@@ -72,7 +75,9 @@ __all__ = [
     "ProviderInfo",
     "ProviderType",
     "GpuAvailability",
+    "GpuOffer",
     "NormalizedPod",
+    "PodSummary",
     # Factory functions
     "register_provider",
     "get_provider_class",
@@ -84,6 +89,7 @@ __all__ = [
     "set_active_provider",
     "get_active_provider",
     "configure_provider",
+    "close_all_providers",
     "clear_all_providers",
     # Provider classes
     "RunPodProvider",
@@ -3,12 +3,18 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import Any, TypedDict
 import httpx
 from fastapi import HTTPException
 
 from ...models.api_models import PodResponse
 
+try:
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class ProviderType(str, Enum):
     """Supported GPU cloud providers."""
@@ -48,6 +54,31 @@ class GpuAvailability:
     available: bool = True
 
 
+class GpuOffer(TypedDict):
+    """Shape of each marketplace GPU offer in Vast.ai's get_gpu_availability().
+
+    Items stay plain dicts like every provider's /api/gpus entries (FastAPI
+    encodes them without a dataclass conversion); this documents and
+    type-checks the keys.
+    """
+    gpuType: str
+    gpuName: str
+    gpuCount: int
+    priceHr: float
+    cloudId: str
+    socket: str
+    region: str | None
+    geolocation: str | None
+    reliabilityScore: float
+    dlPerf: float
+    memoryGb: float
+    storageGb: float
+    cpuCores: float | None
+    cpuRam: float
+    verified: bool
+    provider: str
+
+
 @dataclass
 class NormalizedPod:
     """Normalized pod information across providers."""
@@ -66,6 +97,25 @@ class NormalizedPod:
     team_id: str | None = None
 
 
+class PodSummary(TypedDict):
+    """Shape of each item in a provider's get_pods() "data" list.
+
+    Items stay plain dicts (server code and PodListResponse index them by key),
+    this just documents and type-checks the keys.
+    """
+    id: str
+    name: str
+    status: str
+    gpuName: str
+    gpuCount: int
+    priceHr: float
+    sshConnection: str | None
+    ip: str | None
+    createdAt: str
+    updatedAt: str
+    provider: str
+
+
 class BaseGPUProvider(ABC):
     """Abstract base class for GPU cloud providers.
 
@@ -107,6 +157,12 @@ class BaseGPUProvider(ABC):
             is_active=is_active
         )
 
+    async def aclose(self) -> None:
+        """Close the provider's shared HTTP client, if one was created."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def _make_request(
         self,
         method: str,
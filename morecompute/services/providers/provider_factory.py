@@ -1,5 +1,6 @@
 """Factory and registry for GPU cloud providers."""
 
+import asyncio
 from typing import Type
 from .base_provider import BaseGPUProvider, ProviderInfo, ProviderType
 from ...utils.config_util import load_api_key, save_api_key, _load_config, _save_config
@@ -11,6 +12,9 @@ _PROVIDER_REGISTRY: dict[str, Type[BaseGPUProvider]] = {}
 # Cached provider instances
 _PROVIDER_INSTANCES: dict[str, BaseGPUProvider] = {}
 
+# Pending aclose() tasks for replaced instances (kept so they aren't GC'd mid-close)
+_CLOSING_TASKS: set[asyncio.Task] = set()
+
 
 def register_provider(provider_class: Type[BaseGPUProvider]) -> Type[BaseGPUProvider]:
     """Decorator to register a provider class.
@@ -62,10 +66,30 @@ def get_provider(provider_name: str, force_new: bool = False) -> BaseGPUProvider
 
     # Create instance
     instance = provider_class(api_key=api_key)
+    old_instance = _PROVIDER_INSTANCES.get(provider_name)
     _PROVIDER_INSTANCES[provider_name] = instance
+    if old_instance is not None:
+        _schedule_close(old_instance)
     return instance
 
 
+def _schedule_close(instance: BaseGPUProvider) -> None:
+    """Close a replaced provider's pooled HTTP client in the background.
+
+    Providers keep a long-lived httpx client, so dropping an instance without
+    closing it would leak its open connections. Callers may be synchronous, so
+    the close is scheduled on the running loop; with no loop running there is
+    no client in use to close.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(instance.aclose())
+    _CLOSING_TASKS.add(task)
+    task.add_done_callback(_CLOSING_TASKS.discard)
+
+
 def refresh_provider(provider_name: str) -> BaseGPUProvider | None:
     """Refresh a provider instance (e.g., after API key update).
 
@@ -75,9 +99,7 @@ def refresh_provider(provider_name: str) -> BaseGPUProvider | None:
     Returns:
         New provider instance or None if provider not found
     """
-    # Clear cached instance
-    if provider_name in _PROVIDER_INSTANCES:
-        del _PROVIDER_INSTANCES[provider_name]
+    # Replaces (and closes) the cached instance
     return get_provider(provider_name, force_new=True)
 
 
@@ -189,6 +211,15 @@ def configure_provider(provider_name: str, api_key: str, make_active: bool = Fal
     return True
 
 
+async def close_all_providers() -> None:
+    """Close HTTP clients held by cached provider instances."""
+    for provider in list(_PROVIDER_INSTANCES.values()):
+        try:
+            await provider.aclose()
+        except Exception:
+            pass
+
+
 def clear_all_providers() -> None:
     """Clear all cached provider instances. Useful for testing."""
     _PROVIDER_INSTANCES.clear()
@@ -1,13 +1,102 @@
 """RunPod GPU cloud provider implementation."""
 
+import asyncio
+from types import MappingProxyType
 from typing import Any
 from datetime import datetime
 import httpx
+from cachetools import TTLCache
 from fastapi import HTTPException
 
-from .base_provider import BaseGPUProvider, NormalizedPod
+from .base_provider import BaseGPUProvider, NormalizedPod, PodSummary, HTTP2_AVAILABLE
 from .provider_factory import register_provider
 from ...models.api_models import PodResponse
+from ...utils.json_util import json_dumps, json_loads
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# ijson prefixes of the items _stream_pods collects
+_PODS_ITEM_PREFIX = "data.myself.pods.item"
+_ERRORS_ITEM_PREFIX = "errors.item"
+_STREAM_ITEM_PREFIXES = (_PODS_ITEM_PREFIX, _ERRORS_ITEM_PREFIX)
+
+# GraphQL documents, built once at import time
+_GPU_TYPES_QUERY = """
+query GpuTypes {
+    gpuTypes {
+        id
+        displayName
+        memoryInGb
+        secureCloud
+        communityCloud
+        lowestPrice(input: {gpuCount: 1}) {
+            minimumBidPrice
+            uninterruptablePrice
+        }
+    }
+}
+"""
+
+# Reusable pod selection sets. Only fields that are actually read are requested.
+_POD_PORTS = "runtime { ports { ip isIpPublic privatePort publicPort } }"
+_POD_MIN = "id name desiredStatus"
+_POD_FULL = f"{_POD_MIN} imageName gpuCount costPerHr machineId machine {{ gpuDisplayName }} {_POD_PORTS}"
+
+_CREATE_POD_MUTATION = f"""
+mutation CreatePod($input: PodFindAndDeployOnDemandInput!) {{
+    podFindAndDeployOnDemand(input: $input) {{ {_POD_FULL} }}
+}}
+"""
+
+_POD_SSH_QUERY = f"""
+query Pod($podId: String!) {{
+    pod(input: {{podId: $podId}}) {{ id {_POD_PORTS} }}
+}}
+"""
+
+_POD_QUERY = f"""
+query Pod($podId: String!) {{
+    pod(input: {{podId: $podId}}) {{ {_POD_FULL} }}
+}}
+"""
+
+# get_pods selection sets, keyed by its `fields` argument
+_PODS_QUERIES = {
+    name: f"""
+query Pods {{
+    myself {{
+        pods {{ {selection} }}
+    }}
+}}
+"""
+    for name, selection in (("min", _POD_MIN), ("full", _POD_FULL))
+}
+
+_TERMINATE_MUTATION = """
+mutation TerminatePod($podId: String!) {
+    podTerminate(input: {podId: $podId})
+}
+"""
+
+_STOP_MUTATION = """
+mutation StopPod($podId: String!) {
+    podStop(input: {podId: $podId})
+}
+"""
+
+_RESUME_MUTATION = """
+mutation ResumePod($podId: String!) {
+    podResume(input: {podId: $podId}) {
+        id
+        desiredStatus
+    }
+}
+"""
 
 
 @register_provider
@@ -21,16 +110,80 @@ class RunPodProvider(BaseGPUProvider):
     DASHBOARD_URL = "https://www.runpod.io/console/user/settings"
 
     BASE_URL = "https://api.runpod.io/graphql"
+    DEFAULT_IMAGE = "runpod/pytorch:2.1.0-py3.10-cuda11.8.0-devel-ubuntu22.04"
+
+    # GPU catalog/pricing changes on the order of minutes
+    GPU_TYPES_CACHE_TTL = 30
+    # Lets consecutive pages of get_pods share one myself.pods fetch
+    PODS_CACHE_TTL = 5
+
+    # Guards against parsing huge payloads on the event loop
+    MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+    MAX_PAGE_SIZE = 200
+
+    # Terminated pods are gone for good, so their last state can be reused.
+    # Bounded and expiring so a long-lived process doesn't accumulate them.
+    TERMINAL_CACHE_SIZE = 256
+    TERMINAL_CACHE_TTL = 300
+
+    _STATUS_MAP = {
+        "RUNNING": "ACTIVE",
+        "PENDING": "PENDING",
+        "EXITED": "TERMINATED",
+        "STOPPED": "STOPPED",
+        "STOPPING": "STOPPING",
+        "STARTING": "STARTING",
+        "TERMINATING": "TERMINATING",
+        "TERMINATED": "TERMINATED",
+        "ERROR": "ERROR"
+    }
 
     def __init__(self, api_key: str | None = None):
         super().__init__(api_key)
+        # Headers never change for an instance (refresh_provider builds a new one)
+        self._auth_headers = MappingProxyType({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}" if api_key else ""
+        })
+        self._gpu_types_cache: TTLCache = TTLCache(maxsize=8, ttl=self.GPU_TYPES_CACHE_TTL)
+        self._pods_cache: TTLCache = TTLCache(maxsize=len(_PODS_QUERIES), ttl=self.PODS_CACHE_TTL)
+        # Raw pod data for terminated pods, keyed by pod ID
+        self._terminal_cache: TTLCache = TTLCache(
+            maxsize=self.TERMINAL_CACHE_SIZE, ttl=self.TERMINAL_CACHE_TTL
+        )
 
     def _get_auth_headers(self) -> dict[str, str]:
-        """Get RunPod authentication headers."""
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}" if self.api_key else ""
-        }
+        """Get RunPod authentication headers.
+
+        Returns a copy, since BaseGPUProvider._make_request updates it in place;
+        RunPod requests themselves get _auth_headers as client defaults.
+        """
+        return dict(self._auth_headers)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use.
+
+        Auth headers are set as client defaults so they aren't merged per request.
+        With HTTP/2, concurrent requests are multiplexed over one connection.
+        """
+        if self._client is None or self._client.is_closed:
+            # Long keep-alive means DNS/TCP/TLS setup happens once per pooled
+            # connection; retries covers transient connect failures
+            transport = httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                retries=1,
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=60.0
+                )
+            )
+            self._client = httpx.AsyncClient(
+                headers=self._auth_headers,
+                timeout=30.0,
+                transport=transport
+            )
+        return self._client
 
     async def _graphql_request(
         self,
@@ -49,39 +202,59 @@ class RunPodProvider(BaseGPUProvider):
         Raises:
             HTTPException: On API errors
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.BASE_URL,
-                    headers=self._get_auth_headers(),
-                    json={
-                        "query": query,
-                        "variables": variables or {}
-                    },
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                if "errors" in result:
-                    error_msg = result["errors"][0].get("message", "Unknown error")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"RunPod API error: {error_msg}"
-                    )
-
-                return result.get("data", {})
-            except httpx.HTTPStatusError as e:
+        client = self._get_client()
+        try:
+            # Content-Type is already set in the client's default headers
+            async with client.stream(
+                "POST",
+                self.BASE_URL,
+                content=json_dumps({
+                    "query": query,
+                    "variables": variables or {}
+                })
+            ) as response:
+                body = await self._read_limited(response)
+            if response.is_error:
                 raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"RunPod API error: {e.response.text}"
+                    status_code=response.status_code,
+                    detail=f"RunPod API error: {body.decode('utf-8', errors='replace')}"
                 )
-            except httpx.RequestError as e:
+            result = json_loads(body)
+
+            if "errors" in result:
+                error_msg = result["errors"][0].get("message", "Unknown error")
                 raise HTTPException(
-                    status_code=503,
-                    detail=f"RunPod connection error: {str(e)}"
+                    status_code=400,
+                    detail=f"RunPod API error: {error_msg}"
                 )
 
+            return result.get("data", {})
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"RunPod connection error: {str(e)}"
+            )
+
+    def _check_size(self, size: int) -> None:
+        """Reject responses larger than MAX_RESPONSE_BYTES."""
+        if size > self.MAX_RESPONSE_BYTES:
+            raise HTTPException(
+                status_code=502,
+                detail=f"RunPod response too large ({size} bytes, limit {self.MAX_RESPONSE_BYTES})"
+            )
+
+    async def _read_limited(self, response: httpx.Response) -> bytes:
+        """Read a streamed response body, aborting once it exceeds the size cap."""
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            self._check_size(int(content_length))
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            self._check_size(len(body))
+        return bytes(body)
+
     async def get_gpu_availability(
         self,
         regions: list[str] | None = None,
@@ -102,53 +275,39 @@ class RunPodProvider(BaseGPUProvider):
             secure_cloud: If True, only show GPUs available in Secure Cloud
             community_cloud: If True, only show GPUs available in Community Cloud
         """
-        query = """
-        query GpuTypes {
-            gpuTypes {
-                id
-                displayName
-                memoryInGb
-                secureCloud
-                communityCloud
-                lowestPrice(input: {gpuCount: 1}) {
-                    minimumBidPrice
-                    uninterruptablePrice
-                }
-            }
-        }
-        """
-
-        data = await self._graphql_request(query)
-        gpu_types = data.get("gpuTypes", [])
-
-        # Filter by GPU type if specified
-        if gpu_type:
-            gpu_type_lower = gpu_type.lower()
-            gpu_types = [
-                g for g in gpu_types
-                if gpu_type_lower in g.get("displayName", "").lower()
-                or gpu_type_lower in g.get("id", "").lower()
-            ]
-
-        # Filter by cloud type
-        if secure_cloud is True:
-            gpu_types = [g for g in gpu_types if g.get("secureCloud")]
-        if community_cloud is True:
-            gpu_types = [g for g in gpu_types if g.get("communityCloud")]
-
-        # Transform to normalized format
+        # Cache the raw catalog; all filters below are applied client-side, so
+        # they can share one entry per query
+        gpu_types = self._gpu_types_cache.get(_GPU_TYPES_QUERY)
+        if gpu_types is None:
+            data = await self._graphql_request(_GPU_TYPES_QUERY)
+            gpu_types = data.get("gpuTypes", [])
+            self._gpu_types_cache[_GPU_TYPES_QUERY] = gpu_types
+
+        # Filter and transform in a single pass
+        needle = gpu_type.lower() if gpu_type else None
+        count = gpu_count or 1
         gpus = []
         for gpu in gpu_types:
-            lowest_price = gpu.get("lowestPrice", {})
+            gpu_id = gpu.get("id")
+            display_name = gpu.get("displayName")
+
+            if needle and needle not in (display_name or "").lower() and needle not in (gpu_id or "").lower():
+                continue
+            if secure_cloud is True and not gpu.get("secureCloud"):
+                continue
+            if community_cloud is True and not gpu.get("communityCloud"):
+                continue
+
+            lowest_price = gpu.get("lowestPrice") or {}
             price = lowest_price.get("uninterruptablePrice") or lowest_price.get("minimumBidPrice") or 0
 
             gpus.append({
-                "gpuType": gpu.get("id"),
-                "gpuName": gpu.get("displayName"),
-                "gpuCount": gpu_count or 1,
+                "gpuType": gpu_id,
+                "gpuName": display_name,
+                "gpuCount": count,
                 "priceHr": price,
-                "cloudId": gpu.get("id"),
-                "socket": gpu.get("id"),
+                "cloudId": gpu_id,
+                "socket": gpu_id,
                 "memoryGb": gpu.get("memoryInGb"),
                 "secureCloud": gpu.get("secureCloud"),
                 "communityCloud": gpu.get("communityCloud"),
@@ -172,50 +331,35 @@ class RunPodProvider(BaseGPUProvider):
         """
         pod_config = request.pod if hasattr(request, 'pod') else request
 
-        mutation = """
-        mutation CreatePod($input: PodFindAndDeployOnDemandInput!) {
-            podFindAndDeployOnDemand(input: $input) {
-                id
-                name
-                desiredStatus
-                imageName
-                gpuCount
-                machineId
-                machine {
-                    gpuDisplayName
-                }
-                runtime {
-                    uptimeInSeconds
-                    ports {
-                        ip
-                        isIpPublic
-                        privatePort
-                        publicPort
-                        type
-                    }
-                }
-            }
-        }
-        """
+        # Normalize once so each field is a plain dict lookup. Pydantic fields
+        # left unset come through as None and are dropped below, same as before.
+        # The input dict is built in a single filtered pass, with no second
+        # None-stripping rebuild.
+        if hasattr(pod_config, "model_dump"):
+            cfg = pod_config.model_dump()
+        elif isinstance(pod_config, dict):
+            cfg = pod_config
+        else:
+            cfg = vars(pod_config)
 
         variables = {
             "input": {
-                "name": pod_config.name if hasattr(pod_config, 'name') else pod_config.get("name"),
-                "gpuTypeId": pod_config.gpuType if hasattr(pod_config, 'gpuType') else pod_config.get("gpuType"),
-                "gpuCount": pod_config.gpuCount if hasattr(pod_config, 'gpuCount') else pod_config.get("gpuCount", 1),
-                "volumeInGb": pod_config.diskSize if hasattr(pod_config, 'diskSize') else pod_config.get("diskSize", 20),
-                "containerDiskInGb": 20,
-                "dockerArgs": "",
-                "deployCost": pod_config.maxPrice if hasattr(pod_config, 'maxPrice') else pod_config.get("maxPrice"),
-                "startSsh": True,
-                "imageName": pod_config.image if hasattr(pod_config, 'image') else pod_config.get("image", "runpod/pytorch:2.1.0-py3.10-cuda11.8.0-devel-ubuntu22.04"),
+                k: v for k, v in (
+                    ("name", cfg.get("name")),
+                    ("gpuTypeId", cfg.get("gpuType")),
+                    ("gpuCount", cfg.get("gpuCount", 1)),
+                    ("volumeInGb", cfg.get("diskSize", 20)),
+                    ("containerDiskInGb", 20),
+                    ("dockerArgs", ""),
+                    ("deployCost", cfg.get("maxPrice")),
+                    ("startSsh", True),
+                    ("imageName", cfg.get("image", self.DEFAULT_IMAGE)),
+                ) if v is not None
             }
         }
 
-        # Remove None values
-        variables["input"] = {k: v for k, v in variables["input"].items() if v is not None}
-
-        data = await self._graphql_request(mutation, variables)
+        data = await self._graphql_request(_CREATE_POD_MUTATION, variables)
+        self._pods_cache.clear()
         pod_data = data.get("podFindAndDeployOnDemand", {})
 
         # Get SSH connection info
@@ -242,77 +386,63 @@ class RunPodProvider(BaseGPUProvider):
         if not pod_id:
             return None
 
-        query = """
-        query Pod($podId: String!) {
-            pod(input: {podId: $podId}) {
-                id
-                runtime {
-                    ports {
-                        ip
-                        isIpPublic
-                        privatePort
-                        publicPort
-                        type
-                    }
-                }
-            }
-        }
-        """
-
         try:
-            data = await self._graphql_request(query, {"podId": pod_id})
-            pod = data.get("pod", {})
-            runtime = pod.get("runtime", {})
-            ports = runtime.get("ports", [])
-
-            for port in ports:
-                if port.get("privatePort") == 22 and port.get("isIpPublic"):
-                    ip = port.get("ip")
-                    public_port = port.get("publicPort")
-                    return f"ssh root@{ip} -p {public_port}"
+            data = await self._graphql_request(_POD_SSH_QUERY, {"podId": pod_id})
+            return self._extract_ssh(data.get("pod") or {})
         except Exception:
-            pass
+            return None
 
+    @staticmethod
+    def _extract_ssh(pod_data: dict[str, Any]) -> str | None:
+        """Build the SSH connection string from a pod's public port 22 mapping."""
+        runtime = pod_data.get("runtime") or {}
+        for port in runtime.get("ports") or ():
+            if port.get("privatePort") == 22 and port.get("isIpPublic"):
+                return f"ssh root@{port['ip']} -p {port['publicPort']}"
         return None
 
     async def get_pods(
         self,
         status: str | None = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        fields: str = "full"
     ) -> dict[str, Any]:
-        """Get list of all RunPod pods."""
-        query = """
-        query Pods {
-            myself {
-                pods {
-                    id
-                    name
-                    desiredStatus
-                    imageName
-                    gpuCount
-                    costPerHr
-                    machineId
-                    machine {
-                        gpuDisplayName
-                    }
-                    runtime {
-                        uptimeInSeconds
-                        ports {
-                            ip
-                            isIpPublic
-                            privatePort
-                            publicPort
-                            type
-                        }
-                    }
-                }
-            }
-        }
-        """
+        """Get list of all RunPod pods.
+
+        RunPod's myself.pods takes no pagination or filter arguments, so the
+        full list is fetched once and cached briefly for subsequent pages.
 
-        data = await self._graphql_request(query)
-        pods_raw = data.get("myself", {}).get("pods", [])
+        Args:
+            status: Filter by status
+            limit: Maximum number of results
+            offset: Pagination offset
+            fields: "full" for all pod details, or "min" for just id, name
+                and status (much smaller response for status polling)
+        """
+        if limit > self.MAX_PAGE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"limit must be at most {self.MAX_PAGE_SIZE}; page with offset for more"
+            )
+
+        query = _PODS_QUERIES.get(fields)
+        if query is None:
+            raise HTTPException(status_code=400, detail=f"Unknown fields selection: {fields}")
+
+        pods_raw = self._pods_cache.get(query)
+        if pods_raw is None:
+            if IJSON_AVAILABLE:
+                pods_raw, complete = await self._stream_pods(query, status, offset + limit)
+            else:
+                data = await self._graphql_request(query)
+                pods_raw, complete = data.get("myself", {}).get("pods", []), True
+
+            # A stream that stopped early only holds a prefix of the list
+            if complete:
+                self._pods_cache[query] = pods_raw
+            if fields == "full":
+                self._remember_terminal(pods_raw)
 
         # Filter by status if specified
         if status:
@@ -323,32 +453,23 @@ class RunPodProvider(BaseGPUProvider):
         pods_raw = pods_raw[offset:offset + limit]
 
         # Transform to standardized format
-        pods = []
-        for pod in pods_raw:
-            ssh_connection = None
-            runtime = pod.get("runtime", {})
-            if runtime:
-                ports = runtime.get("ports", [])
-                for port in ports:
-                    if port.get("privatePort") == 22 and port.get("isIpPublic"):
-                        ip = port.get("ip")
-                        public_port = port.get("publicPort")
-                        ssh_connection = f"ssh root@{ip} -p {public_port}"
-                        break
-
-            pods.append({
+        now_iso = datetime.utcnow().isoformat()
+        pods: list[PodSummary] = [
+            {
                 "id": pod.get("id"),
                 "name": pod.get("name"),
                 "status": self._normalize_status(pod.get("desiredStatus", "PENDING")),
                 "gpuName": pod.get("machine", {}).get("gpuDisplayName", ""),
                 "gpuCount": pod.get("gpuCount", 1),
                 "priceHr": pod.get("costPerHr", 0),
-                "sshConnection": ssh_connection,
+                "sshConnection": self._extract_ssh(pod),
                 "ip": None,
-                "createdAt": datetime.utcnow().isoformat(),
-                "updatedAt": datetime.utcnow().isoformat(),
+                "createdAt": now_iso,
+                "updatedAt": now_iso,
                 "provider": self.PROVIDER_NAME
-            })
+            }
+            for pod in pods_raw
+        ]
 
         return {
             "data": pods,
@@ -358,52 +479,118 @@ class RunPodProvider(BaseGPUProvider):
             "provider": self.PROVIDER_NAME
         }
 
+    async def _stream_pods(
+        self,
+        query: str,
+        status: str | None,
+        needed: int
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Stream-parse a pods query, stopping once enough pods have been seen.
+
+        Args:
+            query: Pods GraphQL query
+            status: Status filter the caller will apply (RunPod desiredStatus)
+            needed: Number of status-matching pods required (offset + limit)
+
+        Returns:
+            Tuple of (raw pods seen so far, whether the whole list was read)
+
+        Raises:
+            HTTPException: On API errors
+        """
+        status_upper = status.upper() if status else None
+        pods: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        # One parser pass feeds both item streams; use_float keeps costPerHr
+        # a float as in the non-streaming path (ijson defaults to Decimal)
+        events = ijson.sendable_list()
+        parser = ijson.parse_coro(events, use_float=True)
+        builder = None  # Builds the pod/error currently being read
+        item_prefix = None
+        matched = 0
+
+        def drain_events() -> None:
+            """Turn buffered parse events into complete pods and errors."""
+            nonlocal builder, item_prefix, matched
+            for prefix, event, value in events:
+                if builder is None:
+                    if prefix not in _STREAM_ITEM_PREFIXES or event not in ("start_map", "start_array"):
+                        continue
+                    builder = ijson.ObjectBuilder()
+                    item_prefix = prefix
+                builder.event(event, value)
+                if prefix == item_prefix and event in ("end_map", "end_array"):
+                    item = builder.value
+                    builder = None
+                    if item_prefix == _PODS_ITEM_PREFIX:
+                        pods.append(item)
+                        if not status_upper or (item.get("desiredStatus") or "").upper() == status_upper:
+                            matched += 1
+                    else:
+                        errors.append(item)
+            del events[:]
+
+        client = self._get_client()
+        try:
+            async with client.stream(
+                "POST",
+                self.BASE_URL,
+                content=json_dumps({"query": query, "variables": {}})
+            ) as response:
+                if response.is_error:
+                    body = await self._read_limited(response)
+                    raise HTTPException(
+                        status_code=response.status_code,
+                        detail=f"RunPod API error: {body.decode('utf-8', errors='replace')}"
+                    )
+
+                content_length = response.headers.get("content-length")
+                if content_length and content_length.isdigit():
+                    self._check_size(int(content_length))
+
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    self._check_size(received)
+                    parser.send(chunk)
+                    drain_events()
+                    if matched >= needed:
+                        # Leaving the block closes the response mid-transfer
+                        return pods, False
+
+            parser.close()
+            drain_events()
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"RunPod connection error: {str(e)}"
+            )
+
+        if errors:
+            error_msg = errors[0].get("message", "Unknown error")
+            raise HTTPException(
+                status_code=400,
+                detail=f"RunPod API error: {error_msg}"
+            )
+
+        return pods, True
+
     async def get_pod(self, pod_id: str) -> PodResponse:
-        """Get details for a specific RunPod pod."""
-        query = """
-        query Pod($podId: String!) {
-            pod(input: {podId: $podId}) {
-                id
-                name
-                desiredStatus
-                imageName
-                gpuCount
-                costPerHr
-                machineId
-                machine {
-                    gpuDisplayName
-                }
-                runtime {
-                    uptimeInSeconds
-                    ports {
-                        ip
-                        isIpPublic
-                        privatePort
-                        publicPort
-                        type
-                    }
-                }
-            }
-        }
+        """Get details for a specific RunPod pod.
+
+        Pods already seen terminated are served from cache.
         """
+        pod = self._terminal_cache.get(pod_id)
+        if pod is None:
+            data = await self._graphql_request(_POD_QUERY, {"podId": pod_id})
+            pod = data.get("pod")
 
-        data = await self._graphql_request(query, {"podId": pod_id})
-        pod = data.get("pod")
+            if not pod:
+                raise HTTPException(status_code=404, detail=f"Pod {pod_id} not found")
 
-        if not pod:
-            raise HTTPException(status_code=404, detail=f"Pod {pod_id} not found")
+            self._remember_terminal((pod,))
 
-        # Extract SSH connection
-        ssh_connection = None
-        runtime = pod.get("runtime", {})
-        if runtime:
-            ports = runtime.get("ports", [])
-            for port in ports:
-                if port.get("privatePort") == 22 and port.get("isIpPublic"):
-                    ip = port.get("ip")
-                    public_port = port.get("publicPort")
-                    ssh_connection = f"ssh root@{ip} -p {public_port}"
-                    break
+        ssh_connection = self._extract_ssh(pod)
 
         now = datetime.utcnow()
         return PodResponse(
@@ -421,40 +608,62 @@ class RunPodProvider(BaseGPUProvider):
             updatedAt=now
         )
 
-    async def delete_pod(self, pod_id: str) -> dict[str, Any]:
-        """Delete/terminate a RunPod pod."""
-        mutation = """
-        mutation TerminatePod($podId: String!) {
-            podTerminate(input: {podId: $podId})
-        }
+    def _remember_terminal(self, pods_raw: Any) -> None:
+        """Cache raw pod data for any terminated pods.
+
+        Checks the raw desiredStatus: EXITED also normalizes to TERMINATED but
+        is a stopped pod that can still be resumed outside this app.
         """
+        for pod in pods_raw:
+            pod_id = pod.get("id")
+            if pod_id and pod.get("desiredStatus") == "TERMINATED":
+                self._terminal_cache[pod_id] = pod
+
+    def _invalidate_pod(self, pod_id: str) -> None:
+        """Drop cached state after a mutation on a pod."""
+        self._pods_cache.clear()
+        self._terminal_cache.pop(pod_id, None)
 
-        await self._graphql_request(mutation, {"podId": pod_id})
+    async def delete_pod(self, pod_id: str) -> dict[str, Any]:
+        """Delete/terminate a RunPod pod."""
+        await self._graphql_request(_TERMINATE_MUTATION, {"podId": pod_id})
+        self._invalidate_pod(pod_id)
         return {"success": True, "pod_id": pod_id, "provider": self.PROVIDER_NAME}
 
-    async def stop_pod(self, pod_id: str) -> dict[str, Any]:
-        """Stop a RunPod pod (without deleting)."""
-        mutation = """
-        mutation StopPod($podId: String!) {
-            podStop(input: {podId: $podId})
-        }
+    async def delete_pods(self, pod_ids: list[str]) -> dict[str, Any]:
+        """Terminate several RunPod pods concurrently.
+
+        Args:
+            pod_ids: Pod identifiers to terminate
+
+        Returns:
+            Dict mapping each pod ID to its result, or an error message
         """
+        results = await asyncio.gather(
+            *(self.delete_pod(pod_id) for pod_id in pod_ids),
+            return_exceptions=True
+        )
+        return {
+            "results": {
+                pod_id: (
+                    {"success": False, "error": getattr(result, "detail", str(result))}
+                    if isinstance(result, Exception) else result
+                )
+                for pod_id, result in zip(pod_ids, results)
+            },
+            "provider": self.PROVIDER_NAME
+        }
 
-        await self._graphql_request(mutation, {"podId": pod_id})
+    async def stop_pod(self, pod_id: str) -> dict[str, Any]:
+        """Stop a RunPod pod (without deleting)."""
+        await self._graphql_request(_STOP_MUTATION, {"podId": pod_id})
+        self._invalidate_pod(pod_id)
         return {"success": True, "pod_id": pod_id, "action": "stopped"}
 
     async def resume_pod(self, pod_id: str) -> dict[str, Any]:
         """Resume a stopped RunPod pod."""
-        mutation = """
-        mutation ResumePod($podId: String!) {
-            podResume(input: {podId: $podId}) {
-                id
-                desiredStatus
-            }
-        }
-        """
-
-        data = await self._graphql_request(mutation, {"podId": pod_id})
+        data = await self._graphql_request(_RESUME_MUTATION, {"podId": pod_id})
+        self._invalidate_pod(pod_id)
         return {
             "success": True,
             "pod_id": pod_id,
@@ -463,31 +672,21 @@ class RunPodProvider(BaseGPUProvider):
 
     def _normalize_status(self, runpod_status: str) -> str:
         """Convert RunPod status to normalized status."""
-        status_map = {
-            "RUNNING": "ACTIVE",
-            "PENDING": "PENDING",
-            "EXITED": "TERMINATED",
-            "STOPPED": "STOPPED",
-            "STOPPING": "STOPPING",
-            "STARTING": "STARTING",
-            "TERMINATING": "TERMINATING",
-            "TERMINATED": "TERMINATED",
-            "ERROR": "ERROR"
-        }
-        return status_map.get(runpod_status.upper(), runpod_status)
-
-    def normalize_pod(self, pod_data: dict[str, Any]) -> NormalizedPod:
-        """Convert RunPod pod data to normalized format."""
-        ssh_connection = None
-        runtime = pod_data.get("runtime", {})
-        if runtime:
-            ports = runtime.get("ports", [])
-            for port in ports:
-                if port.get("privatePort") == 22 and port.get("isIpPublic"):
-                    ip = port.get("ip")
-                    public_port = port.get("publicPort")
-                    ssh_connection = f"ssh root@{ip} -p {public_port}"
-                    break
+        # RunPod already returns uppercase statuses; only upper() on a miss
+        status_map = self._STATUS_MAP
+        return status_map.get(runpod_status) or status_map.get(runpod_status.upper(), runpod_status)
+
+    def normalize_pod(self, pod_data: dict[str, Any], now_iso: str | None = None) -> NormalizedPod:
+        """Convert RunPod pod data to normalized format.
+
+        Args:
+            pod_data: Raw pod data from the RunPod API
+            now_iso: Timestamp to use for created/updated; pass one in when
+                normalizing a batch so it is computed once
+        """
+        ssh_connection = self._extract_ssh(pod_data)
+        if now_iso is None:
+            now_iso = datetime.utcnow().isoformat()
 
         return NormalizedPod(
             id=pod_data.get("id", ""),
@@ -499,6 +698,6 @@ class RunPodProvider(BaseGPUProvider):
             ssh_connection=ssh_connection,
             ip=None,
             provider=self.PROVIDER_NAME,
-            created_at=datetime.utcnow().isoformat(),
-            updated_at=datetime.utcnow().isoformat()
+            created_at=now_iso,
+            updated_at=now_iso
         )
@@ -1,12 +1,64 @@
 """Vast.ai GPU cloud provider implementation."""
 
-import json
+import asyncio
+import random
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 from datetime import datetime, timezone
 
-from .base_provider import BaseGPUProvider, NormalizedPod
+import httpx
+from cachetools import TTLCache
+from fastapi import HTTPException
+
+from .base_provider import BaseGPUProvider, GpuOffer, NormalizedPod, HTTP2_AVAILABLE
 from .provider_factory import register_provider
 from ...models.api_models import PodResponse
+from ...utils.rate_limiter import AsyncTokenBucket, parse_retry_after
+from ...utils.json_util import json_dumps, json_loads
+
+
+@lru_cache(maxsize=128)
+def _encode_offer_query(
+    verified: bool | None,
+    gpu_count: int | None,
+    min_reliability: float | None,
+    min_gpu_ram: float | None,
+    gpu_name: str | None = None
+) -> str:
+    """Build and JSON-encode the /bundles offer query for a set of filters.
+
+    Memoized on the (hashable) filter arguments, since dashboards poll with the
+    same handful of filter combinations.
+    """
+    query: dict[str, Any] = {
+        "rentable": {"eq": True},
+        "rented": {"eq": False},
+        "order": [["dph_total", "asc"]],  # Sort by price
+        "type": "on-demand"
+    }
+
+    # Filter by verified status (default to True if not specified)
+    if verified is True or verified is None:
+        query["verified"] = {"eq": True}
+
+    # Filter by GPU count
+    if gpu_count:
+        query["num_gpus"] = {"gte": gpu_count}
+
+    # Filter by reliability
+    if min_reliability is not None:
+        query["reliability2"] = {"gte": min_reliability}
+
+    # Filter by GPU RAM (in MB for Vast.ai)
+    if min_gpu_ram is not None:
+        query["gpu_ram"] = {"gte": min_gpu_ram * 1024}  # Convert GB to MB
+
+    # Exact GPU model name, so the server only returns matching offers
+    if gpu_name:
+        query["gpu_name"] = {"eq": gpu_name}
+
+    return json_dumps(query).decode()
 
 
 @register_provider
@@ -24,15 +76,96 @@ class VastAIProvider(BaseGPUProvider):
 
     BASE_URL = "https://console.vast.ai/api/v0"
 
+    # Vast.ai authenticates via the api_key query param, so headers are static
+    _AUTH_HEADERS = MappingProxyType({
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    })
+
+    # How long GET responses (/bundles, /instances) are reused across polls
+    RESPONSE_CACHE_TTL = 2.0
+    RESPONSE_CACHE_SIZE = 64
+
+    # Client-side rate limit for console.vast.ai, shared by all instances
+    RATE_LIMIT_PER_SEC = 5.0
+    RATE_LIMIT_BURST = 10
+    MAX_RETRIES = 3
+    # GETs are safe to repeat. Other methods only retry 429, which means the
+    # request was rejected before it ran; a gateway 503 can arrive after a
+    # create or destroy already happened upstream.
+    RETRY_STATUSES = (429, 503)
+    MUTATION_RETRY_STATUSES = (429,)
+    _rate_limiter: AsyncTokenBucket | None = None
+
+    # Cap on concurrent in-flight requests to the Vast.ai host
+    MAX_CONCURRENT_REQUESTS = 32
+    _request_semaphore: asyncio.Semaphore | None = None
+
+    # Map Vast.ai actual_status values to normalized statuses
+    _STATUS_MAP = {
+        "running": "ACTIVE",
+        "loading": "STARTING",
+        "created": "PENDING",
+        "exited": "STOPPED",
+        "offline": "STOPPED",
+        "error": "ERROR",
+        "destroying": "TERMINATING"
+    }
+
     def __init__(self, api_key: str | None = None):
         super().__init__(api_key)
+        # (/instances response, its by-ID index), rebuilt only when the response changes
+        self._instances_index: tuple[dict[str, Any], dict[str, dict[str, Any]]] | None = None
+        self._resp_cache: TTLCache = TTLCache(maxsize=self.RESPONSE_CACHE_SIZE, ttl=self.RESPONSE_CACHE_TTL)
+        # Bumped by every mutation so GETs that started before it don't
+        # cache (or share) results that may predate the change
+        self._cache_generation = 0
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use.
+
+        Keeping one client alive lets httpx reuse keep-alive connections
+        across calls instead of redoing TCP+TLS setup per request. With h2
+        installed, concurrent requests are multiplexed over one connection.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers=self._AUTH_HEADERS,
+                timeout=30.0,
+                follow_redirects=True,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
 
     def _get_auth_headers(self) -> dict[str, str]:
-        """Get Vast.ai authentication headers."""
-        return {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        """Get Vast.ai authentication headers.
+
+        Returns a copy, since BaseGPUProvider._make_request updates it in place;
+        Vast.ai requests themselves get _AUTH_HEADERS as client defaults.
+        """
+        return dict(self._AUTH_HEADERS)
+
+    @classmethod
+    def _get_rate_limiter(cls) -> AsyncTokenBucket:
+        """Get the token bucket shared by all Vast.ai provider instances."""
+        if cls._rate_limiter is None:
+            cls._rate_limiter = AsyncTokenBucket(cls.RATE_LIMIT_PER_SEC, cls.RATE_LIMIT_BURST)
+        return cls._rate_limiter
+
+    @classmethod
+    def _get_request_semaphore(cls) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent Vast.ai requests (created lazily)."""
+        if cls._request_semaphore is None:
+            cls._request_semaphore = asyncio.Semaphore(cls.MAX_CONCURRENT_REQUESTS)
+        return cls._request_semaphore
+
+    def _invalidate_responses(self) -> None:
+        """Drop cached GET responses and keep in-flight GETs from re-caching theirs."""
+        self._resp_cache.clear()
+        self._cache_generation += 1
 
     async def _make_vast_request(
         self,
@@ -43,44 +176,122 @@ class VastAIProvider(BaseGPUProvider):
     ) -> dict[str, Any]:
         """Make an authenticated request to Vast.ai API.
 
-        Vast.ai uses api_key as a query parameter.
+        GET responses are reused for RESPONSE_CACHE_TTL seconds, and
+        concurrent identical GETs share a single in-flight request. Any
+        non-GET request clears the response cache, and GETs that overlap it
+        don't write their results back.
         """
-        import httpx
-        from fastapi import HTTPException
+        if method != "GET":
+            # Any mutation can change offers and instances alike
+            self._invalidate_responses()
+            try:
+                return await self._send_vast_request(method, endpoint, params, json_data)
+            finally:
+                # GETs that overlapped the mutation may have read pre-change state
+                self._invalidate_responses()
+
+        cache_key = (endpoint, tuple(sorted((params or {}).items())))
+        cached = self._resp_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        generation = self._cache_generation
+        inflight_key = (generation, cache_key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            # The request runs in its own task so one caller being cancelled
+            # doesn't cancel it for everyone else waiting on the same GET
+            task = asyncio.create_task(
+                self._fetch_and_cache(generation, cache_key, endpoint, params)
+            )
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(inflight_key, t))
+        return await asyncio.shield(task)
 
-        url = f"{self.BASE_URL}{endpoint}"
+    async def _fetch_and_cache(
+        self,
+        generation: int,
+        cache_key: tuple,
+        endpoint: str,
+        params: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        """Send a GET and cache the result unless a mutation ran meanwhile."""
+        result = await self._send_vast_request("GET", endpoint, params)
+        if generation == self._cache_generation:
+            self._resp_cache[cache_key] = result
+        return result
+
+    def _finish_inflight(self, inflight_key: tuple, task: asyncio.Task) -> None:
+        """Forget a finished in-flight GET."""
+        if self._inflight.get(inflight_key) is task:
+            del self._inflight[inflight_key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved in case every waiter was cancelled
+
+    async def _send_vast_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Send a request to Vast.ai API.
 
+        Vast.ai uses api_key as a query parameter. Requests go through a
+        shared token bucket, and 429 responses (plus 503 for GETs) are
+        retried with backoff (honoring Retry-After).
+        """
         # Add API key to params
-        if params is None:
-            params = {}
+        params = dict(params) if params else {}
         params["api_key"] = self.api_key
 
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=self._get_auth_headers(),
-                    params=params,
-                    json=json_data,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-
-                if response.status_code == 204 or not response.content:
-                    return {}
-
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"Vast.ai API error: {e.response.text}"
-                )
-            except httpx.RequestError as e:
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"Vast.ai connection error: {str(e)}"
-                )
+        retry_statuses = self.RETRY_STATUSES if method == "GET" else self.MUTATION_RETRY_STATUSES
+        client = self._get_client()
+        limiter = self._get_rate_limiter()
+        semaphore = self._get_request_semaphore()
+        try:
+            for attempt in range(self.MAX_RETRIES + 1):
+                await limiter.acquire()
+                async with semaphore:
+                    response = await client.request(
+                        method=method,
+                        url=endpoint,
+                        params=params,
+                        json=json_data
+                    )
+
+                headers = response.headers
+                remaining = headers.get("x-ratelimit-remaining")
+                if remaining is not None and remaining.isdigit():
+                    limiter.retune(int(remaining), parse_retry_after(headers.get("x-ratelimit-reset")))
+
+                if response.status_code not in retry_statuses or attempt == self.MAX_RETRIES:
+                    break
+
+                # Back off everyone sharing the limiter, not just this call
+                delay = parse_retry_after(headers.get("retry-after"))
+                if delay is None:
+                    delay = 2 ** attempt + random.random()
+                limiter.pause(delay)
+
+            response.raise_for_status()
+
+            content = response.content
+            if response.status_code == 204 or not content:
+                return {}
+
+            # orjson (when installed) is several times faster on large /bundles payloads
+            return json_loads(content)
+        except httpx.HTTPStatusError as e:
+            raise HTTPException(
+                status_code=e.response.status_code,
+                detail=f"Vast.ai API error: {e.response.text}"
+            )
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Vast.ai connection error: {str(e)}"
+            )
 
     async def get_gpu_availability(
         self,
@@ -90,6 +301,7 @@ class VastAIProvider(BaseGPUProvider):
         verified: bool | None = None,
         min_reliability: float | None = None,
         min_gpu_ram: float | None = None,
+        exact: bool = False,
         **kwargs: Any
     ) -> dict[str, Any]:
         """Get available GPU offers from Vast.ai marketplace.
@@ -99,79 +311,32 @@ class VastAIProvider(BaseGPUProvider):
         Args:
             regions: Filter by region/geolocation
             gpu_count: Minimum number of GPUs
-            gpu_type: Filter by GPU name (exact match)
+            gpu_type: Filter by GPU name (case-insensitive partial match)
             verified: If True, only show verified hosts
             min_reliability: Minimum reliability score (0.0-1.0)
             min_gpu_ram: Minimum GPU RAM in GB
+            exact: If True, match gpu_type exactly on the server instead of
+                fetching every offer and partial-matching client-side
         """
-        # Build query for offers
-        query = {
-            "rentable": {"eq": True},
-            "rented": {"eq": False},
-            "order": [["dph_total", "asc"]],  # Sort by price
-            "type": "on-demand"
-        }
-
-        # Filter by verified status (default to True if not specified)
-        if verified is True or verified is None:
-            query["verified"] = {"eq": True}
-
-        # Filter by GPU type (partial match using contains-like behavior)
-        if gpu_type:
-            # Vast.ai uses exact match, so we'll do client-side filtering for partial match
-            pass
-
-        # Filter by GPU count
-        if gpu_count:
-            query["num_gpus"] = {"gte": gpu_count}
-
-        # Filter by reliability
-        if min_reliability is not None:
-            query["reliability2"] = {"gte": min_reliability}
-
-        # Filter by GPU RAM (in MB for Vast.ai)
-        if min_gpu_ram is not None:
-            query["gpu_ram"] = {"gte": min_gpu_ram * 1024}  # Convert GB to MB
-
+        # gpu_name only goes to the server for exact lookups; otherwise the
+        # partial match below needs the unfiltered offer list
         response = await self._make_vast_request(
             "GET",
             "/bundles",
-            params={"q": json.dumps(query)}
+            params={"q": _encode_offer_query(
+                verified, gpu_count, min_reliability, min_gpu_ram,
+                gpu_type if exact else None
+            )}
         )
-
         offers = response.get("offers", [])
 
         # Transform to standardized format
-        gpus = []
-        for offer in offers:
-            # Filter by region if specified
-            if regions and offer.get("geolocation", "").split(",")[0] not in regions:
-                continue
-
-            # Client-side filter by GPU type (partial match)
-            if gpu_type:
-                gpu_name = offer.get("gpu_name", "").lower()
-                if gpu_type.lower() not in gpu_name:
-                    continue
-
-            gpus.append({
-                "gpuType": offer.get("gpu_name", ""),
-                "gpuName": offer.get("gpu_name", ""),
-                "gpuCount": offer.get("num_gpus", 1),
-                "priceHr": offer.get("dph_total", 0),
-                "cloudId": str(offer.get("id")),
-                "socket": str(offer.get("id")),
-                "region": offer.get("geolocation", "").split(",")[0] if offer.get("geolocation") else None,
-                "geolocation": offer.get("geolocation"),
-                "reliabilityScore": offer.get("reliability2", offer.get("reliability", 0)),
-                "dlPerf": offer.get("dlperf", 0),
-                "memoryGb": offer.get("gpu_ram", 0) / 1024,  # Convert MB to GB
-                "storageGb": offer.get("disk_space", 0),
-                "cpuCores": offer.get("cpu_cores_effective"),
-                "cpuRam": offer.get("cpu_ram", 0) / 1024,  # Convert MB to GB
-                "verified": offer.get("verified", False),
-                "provider": self.PROVIDER_NAME
-            })
+        gpu_type_lower = gpu_type.lower() if gpu_type else None
+        gpus = [
+            self._offer_to_gpu(offer)
+            for offer in offers
+            if self._offer_matches(offer, regions, gpu_type_lower)
+        ]
 
         return {
             "data": gpus,
@@ -179,6 +344,48 @@ class VastAIProvider(BaseGPUProvider):
             "provider": self.PROVIDER_NAME
         }
 
+    @staticmethod
+    def _offer_matches(
+        offer: dict[str, Any],
+        regions: list[str] | None,
+        gpu_type_lower: str | None
+    ) -> bool:
+        """Check an offer against the client-side region and GPU name filters."""
+        # Filter by region if specified
+        if regions and (offer.get("geolocation") or "").split(",")[0] not in regions:
+            return False
+
+        # Client-side filter by GPU type (partial match)
+        if gpu_type_lower and gpu_type_lower not in (offer.get("gpu_name") or "").lower():
+            return False
+
+        return True
+
+    def _offer_to_gpu(self, offer: dict[str, Any]) -> GpuOffer:
+        """Convert a Vast.ai offer to the standardized GPU format."""
+        g = offer.get
+        offer_id = str(g("id"))
+        gpu_name = g("gpu_name", "")
+        geolocation = g("geolocation")
+        return GpuOffer(
+            gpuType=gpu_name,
+            gpuName=gpu_name,
+            gpuCount=g("num_gpus", 1),
+            priceHr=g("dph_total", 0),
+            cloudId=offer_id,
+            socket=offer_id,
+            region=geolocation.split(",")[0] if geolocation else None,
+            geolocation=geolocation,
+            reliabilityScore=g("reliability2", g("reliability", 0)),
+            dlPerf=g("dlperf", 0),
+            memoryGb=g("gpu_ram", 0) / 1024,  # Convert MB to GB
+            storageGb=g("disk_space", 0),
+            cpuCores=g("cpu_cores_effective"),
+            cpuRam=g("cpu_ram", 0) / 1024,  # Convert MB to GB
+            verified=g("verified", False),
+            provider=self.PROVIDER_NAME
+        )
+
     async def create_pod(self, request: Any) -> PodResponse:
         """Create a new Vast.ai instance.
 
@@ -188,9 +395,6 @@ class VastAIProvider(BaseGPUProvider):
         Returns:
             PodResponse with created instance info
         """
-        import sys
-        from fastapi import HTTPException
-
         pod_config = request.pod if hasattr(request, 'pod') else request
 
         offer_id = pod_config.cloudId if hasattr(pod_config, 'cloudId') else pod_config.get("cloudId")
@@ -263,6 +467,7 @@ class VastAIProvider(BaseGPUProvider):
         instances = instances[offset:offset + limit]
 
         # Transform to standardized format
+        now_iso = datetime.now(timezone.utc).isoformat()
         pods = []
         for instance in instances:
             ssh_connection = self._build_ssh_connection(instance)
@@ -277,8 +482,8 @@ class VastAIProvider(BaseGPUProvider):
                 "sshConnection": ssh_connection,
                 "ip": instance.get("public_ipaddr"),
                 "region": instance.get("geolocation", "").split(",")[0] if instance.get("geolocation") else None,
-                "createdAt": instance.get("start_date", datetime.now(timezone.utc).isoformat()),
-                "updatedAt": datetime.now(timezone.utc).isoformat(),
+                "createdAt": instance.get("start_date", now_iso),
+                "updatedAt": now_iso,
                 "provider": self.PROVIDER_NAME
             })
 
@@ -290,22 +495,64 @@ class VastAIProvider(BaseGPUProvider):
             "provider": self.PROVIDER_NAME
         }
 
-    async def get_pod(self, pod_id: str) -> PodResponse:
-        """Get details for a specific Vast.ai instance."""
-        from fastapi import HTTPException
+    async def _get_instances_by_id(self) -> dict[str, dict[str, Any]]:
+        """Get the user's instances indexed by ID.
 
+        Freshness and request sharing come from the GET response cache alone;
+        the index is rebuilt only when a new /instances response comes back,
+        so per-pod lookups stay O(1) between refreshes.
+        """
         response = await self._make_vast_request(
             "GET",
             "/instances",
             params={"owner": "me"}
         )
+        cached = self._instances_index
+        if cached is not None and cached[0] is response:
+            return cached[1]
 
-        instances = response.get("instances", [])
-        instance = next((i for i in instances if str(i.get("id")) == pod_id), None)
+        by_id = {str(i.get("id")): i for i in response.get("instances", [])}
+        self._instances_index = (response, by_id)
+        return by_id
+
+    async def get_pod(self, pod_id: str) -> PodResponse:
+        """Get details for a specific Vast.ai instance."""
+        instance = (await self._get_instances_by_id()).get(pod_id)
 
         if not instance:
             raise HTTPException(status_code=404, detail=f"Instance {pod_id} not found")
 
+        return self._instance_to_response(instance)
+
+    async def get_pods_bulk(self, pod_ids: list[str]) -> dict[str, PodResponse]:
+        """Get several Vast.ai instances from a single /instances fetch.
+
+        Args:
+            pod_ids: Instance identifiers to look up
+
+        Returns:
+            Dict mapping each found instance ID to its PodResponse; unknown
+            IDs are omitted
+        """
+        by_id = await self._get_instances_by_id()
+        return {
+            pod_id: self._instance_to_response(by_id[pod_id])
+            for pod_id in dict.fromkeys(pod_ids)
+            if pod_id in by_id
+        }
+
+    async def get_pod_status(self, pod_ids: list[str]) -> dict[str, Any]:
+        """Get status for multiple instances with one /instances fetch."""
+        pods = await self.get_pods_bulk(pod_ids)
+        return {
+            "statuses": {
+                pod_id: pods[pod_id].status if pod_id in pods else "unknown"
+                for pod_id in pod_ids
+            }
+        }
+
+    def _instance_to_response(self, instance: dict[str, Any]) -> PodResponse:
+        """Build a PodResponse from raw Vast.ai instance data."""
         ssh_connection = self._build_ssh_connection(instance)
 
         now = datetime.now(timezone.utc)
@@ -377,20 +624,21 @@ class VastAIProvider(BaseGPUProvider):
 
     def _normalize_status(self, vast_status: str) -> str:
         """Convert Vast.ai status to normalized status."""
-        status_map = {
-            "running": "ACTIVE",
-            "loading": "STARTING",
-            "created": "PENDING",
-            "exited": "STOPPED",
-            "offline": "STOPPED",
-            "error": "ERROR",
-            "destroying": "TERMINATING"
-        }
-        return status_map.get(vast_status.lower(), vast_status.upper())
+        status_map = self._STATUS_MAP
+        # Vast.ai already reports lowercase statuses, so try that before lower()
+        return status_map.get(vast_status) or status_map.get(vast_status.lower(), vast_status.upper())
+
+    def normalize_pod(self, pod_data: dict[str, Any], now_iso: str | None = None) -> NormalizedPod:
+        """Convert Vast.ai instance data to normalized format.
 
-    def normalize_pod(self, pod_data: dict[str, Any]) -> NormalizedPod:
-        """Convert Vast.ai instance data to normalized format."""
+        Args:
+            pod_data: Raw instance data from the Vast.ai API
+            now_iso: Timestamp to use for created/updated; pass one in when
+                normalizing a batch so it is computed once
+        """
         ssh_connection = self._build_ssh_connection(pod_data)
+        if now_iso is None:
+            now_iso = datetime.now(timezone.utc).isoformat()
 
         return NormalizedPod(
             id=str(pod_data.get("id", "")),
@@ -402,6 +650,6 @@ class VastAIProvider(BaseGPUProvider):
             ssh_connection=ssh_connection,
             ip=pod_data.get("public_ipaddr"),
             provider=self.PROVIDER_NAME,
-            created_at=pod_data.get("start_date", datetime.now(timezone.utc).isoformat()),
-            updated_at=datetime.now(timezone.utc).isoformat()
+            created_at=pod_data.get("start_date", now_iso),
+            updated_at=now_iso
         )
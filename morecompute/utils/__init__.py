@@ -7,11 +7,14 @@ from .system_environment_util import DeviceMetrics
 from .error_utils import ErrorUtils
 from .cache_util import make_cache_key
 from .notebook_util import coerce_cell_source
+from .json_util import json_dumps, json_loads
 
 __all__ = [
     'PythonEnvironmentDetector',
     'DeviceMetrics',
     'ErrorUtils',
     'make_cache_key',
-    'coerce_cell_source'
+    'coerce_cell_source',
+    'json_dumps',
+    'json_loads'
 ]
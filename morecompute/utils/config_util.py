@@ -4,12 +4,30 @@ from pathlib import Path
 from typing import Optional
 import os
 import json
+import tempfile
 
 
 # Global config directory in user's home
 CONFIG_DIR = Path.home() / ".morecompute"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Parsed config keyed by the file's mtime, so repeat reads cost a single stat()
+_CACHE: tuple[int, dict] | None = None
+
+# Known provider API key names (SSH-based providers only)
+_PROVIDER_KEY_NAMES = (
+    "RUNPOD_API_KEY",
+    "LAMBDA_LABS_API_KEY",
+    "VASTAI_API_KEY",
+)
+
+# Provider to key name mappings (SSH-based providers only)
+_PROVIDER_KEYS: dict[str, tuple[str, ...]] = {
+    "runpod": ("RUNPOD_API_KEY",),
+    "lambda_labs": ("LAMBDA_LABS_API_KEY",),
+    "vastai": ("VASTAI_API_KEY",),
+}
+
 
 def _ensure_config_dir() -> None:
     """Ensure the config directory exists with secure permissions."""
@@ -17,23 +35,52 @@ def _ensure_config_dir() -> None:
 
 
 def _load_config() -> dict:
-    """Load config from JSON file."""
-    if not CONFIG_FILE.exists():
+    """
+    Load config from JSON file.
+
+    The parsed result is cached and reused until the file's mtime changes.
+    Callers get a shallow copy, so mutating it never touches the cache.
+    """
+    global _CACHE
+    try:
+        mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
         return {}
+
+    if _CACHE is not None and _CACHE[0] == mtime_ns:
+        return dict(_CACHE[1])
+
     try:
         with CONFIG_FILE.open("r", encoding="utf-8") as f:
-            return json.load(f)
+            config = json.load(f)
     except (json.JSONDecodeError, IOError):
         return {}
 
+    _CACHE = (mtime_ns, config)
+    return dict(config)
+
 
 def _save_config(config: dict) -> None:
-    """Save config to JSON file with secure permissions."""
+    """
+    Save config to JSON file with secure permissions.
+
+    Writes to a temp file in the same directory and renames it over the
+    config, so concurrent readers never see a partially written file.
+    """
+    global _CACHE
+    _CACHE = None
     _ensure_config_dir()
-    with CONFIG_FILE.open("w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2)
-    # Set secure file permissions (owner read/write only)
-    CONFIG_FILE.chmod(0o600)
+    # Unique temp name, since the server and kernel processes may save at once
+    fd, tmp_path = tempfile.mkstemp(dir=CONFIG_DIR, prefix=CONFIG_FILE.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            # Owner read/write only before any secrets are written
+            os.fchmod(f.fileno(), 0o600)
+            json.dump(config, f, indent=2)
+        os.replace(tmp_path, CONFIG_FILE)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
 
 
 def load_api_key(key_name: str) -> Optional[str]:
@@ -126,22 +173,12 @@ def get_all_configured_keys() -> dict[str, bool]:
         Dict mapping key names to True/False
     """
     config = _load_config()
-
-    # Known provider API key names (SSH-based providers only)
-    key_names = [
-        "RUNPOD_API_KEY",
-        "LAMBDA_LABS_API_KEY",
-        "VASTAI_API_KEY",
-    ]
-
-    result = {}
-    for key_name in key_names:
-        # Check environment first, then config
-        env_val = os.getenv(key_name)
-        config_val = config.get(key_name)
-        result[key_name] = bool(env_val or config_val)
-
-    return result
+    environ = os.environ
+    # Check environment first, then config (empty values count as unset)
+    return {
+        key_name: bool(environ.get(key_name) or config.get(key_name))
+        for key_name in _PROVIDER_KEY_NAMES
+    }
 
 
 def get_provider_api_keys(provider_name: str) -> dict[str, Optional[str]]:
@@ -154,12 +191,11 @@ def get_provider_api_keys(provider_name: str) -> dict[str, Optional[str]]:
     Returns:
         Dict mapping key names to their values (or None if not set)
     """
-    # Provider to key name mappings (SSH-based providers only)
-    provider_keys = {
-        "runpod": ["RUNPOD_API_KEY"],
-        "lambda_labs": ["LAMBDA_LABS_API_KEY"],
-        "vastai": ["VASTAI_API_KEY"],
-    }
+    key_names = _PROVIDER_KEYS.get(provider_name, ())
+    if not key_names:
+        return {}
 
-    key_names = provider_keys.get(provider_name, [])
-    return {key: load_api_key(key) for key in key_names}
+    # One config load for all keys; environment takes precedence, as in load_api_key
+    config = _load_config()
+    environ = os.environ
+    return {key: environ.get(key) or config.get(key) for key in key_names}
@@ -0,0 +1,43 @@
+"""Fast JSON encode/decode helpers.
+
+Uses orjson when installed and falls back to the stdlib json module.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        Encoded JSON as bytes
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data: bytes | bytearray | str) -> Any:
+    """
+    Parse JSON from bytes or str.
+
+    Args:
+        data: Raw JSON payload
+
+    Returns:
+        Decoded Python object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -344,7 +344,7 @@ class LineMagicHandlers:
         """
         pip_command = 'pip ' + ' '.join(args)
         return await special_handler._execute_shell_command(
-            pip_command, result, time.time(), websocket
+            pip_command, result, time.perf_counter(), websocket
         )
 
     async def handle_load(self, args: list, result: Dict[str, Any],
@@ -1,87 +1,478 @@
 import os
+import re
 import sys
 import json
+import shutil
 import subprocess
-import platform
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Iterator
 
 
-class PythonEnvironmentDetector:
-    """Detects Python environments (system Python and conda)"""
+_IS_WINDOWS = os.name == 'nt'
 
-    def __init__(self):
-        self.system = platform.system().lower()
+# Interpreter location relative to an env root. On Windows, conda keeps
+# python.exe at the root and venvs put it in Scripts
+if _IS_WINDOWS:
+    _ENV_PYTHON_SUBPATHS = ('python.exe', os.path.join('Scripts', 'python.exe'))
+else:
+    _ENV_PYTHON_SUBPATHS = (os.path.join('bin', 'python'),)
 
-    def detect_all_environments(self) -> list[dict[str, str]]:
-        """Detect all Python environments on the system"""
-        environments = []
+# Last scan result, reused while none of the paths it depends on have changed
+ENV_CACHE_FILE = Path.home() / ".morecompute" / "pyenvs.json"
 
-        try:
-            # 1. Conda environments (check first for proper naming)
-            environments.extend(self._detect_conda_environments())
-        except Exception as e:
-            print(f"Warning: Conda detection failed: {e}")
+# python, python3, python3.11 (and .exe variants); not python3-config etc.
+_PYTHON_EXE_RE = re.compile(r'^python(?:\d+(?:\.\d+)?)?(?:\.exe)?$', re.I)
+
+_SHIM_PYTHON_NAMES = ('python', 'python3', 'python.exe', 'python3.exe')
+
+_PY_VERSION_RE = re.compile(r'^#define\s+PY_VERSION\s+"([^"]+)"', re.M)
+
+# Callbacks waiting on the single in-flight background scan; a scan thread is
+# only started when this goes from empty to non-empty
+_background_callbacks: list[Callable[[list[dict[str, str]]], None]] = []
+_background_lock = threading.Lock()
+
+
+def _read_patchlevel_version(real_path: str) -> str | None:
+    """
+    Read an interpreter's version from its install's patchlevel.h.
 
+    Works for prefix layouts (``<prefix>/bin/python3.X`` with
+    ``<prefix>/include/python3.X/patchlevel.h``) such as conda, pyenv and
+    distro Pythons with headers installed. Returns None if the header is
+    not found, so callers can fall back to running the interpreter.
+
+    Args:
+        real_path: Fully resolved path to the Python executable
+
+    Returns:
+        Version string like "3.11.4", or None
+    """
+    bin_dir, exe_name = os.path.split(real_path)
+    include_dir = os.path.join(os.path.dirname(bin_dir), 'include')
+
+    # Prefer the include dir named after the binary (python3.11, python3.13t)
+    header = os.path.join(include_dir, exe_name, 'patchlevel.h')
+    if not os.path.isfile(header):
         try:
-            # 2. System Python installations
-            environments.extend(self._detect_system_python())
-        except Exception as e:
-            print(f"Warning: System Python detection failed: {e}")
+            candidates = [name for name in os.listdir(include_dir) if name.startswith('python3')]
+        except OSError:
+            return None
+        # Only trust the header if it can't belong to a different version
+        if len(candidates) != 1:
+            return None
+        header = os.path.join(include_dir, candidates[0], 'patchlevel.h')
+
+    try:
+        with open(header, encoding='utf-8') as f:
+            match = _PY_VERSION_RE.search(f.read())
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+@lru_cache(maxsize=256)
+def _resolve_python_version(real_path: str, mtime_ns: int) -> str:
+    """
+    Get an interpreter's version, reading patchlevel.h before running it.
+
+    Cached by (resolved path, binary mtime). Failures raise instead of
+    returning None, so lru_cache does not remember them and a transient
+    failure (e.g. a cold-start timeout) is retried on the next scan.
+
+    Args:
+        real_path: Fully resolved path to the Python executable
+        mtime_ns: The executable's st_mtime_ns, used only as a cache key
 
+    Returns:
+        Version string like "3.11.4"
+
+    Raises:
+        LookupError: If the version could not be determined
+    """
+    version = _read_patchlevel_version(real_path)
+    if version:
+        return version
+
+    # -S skips site.py and -I ignores PYTHON* env vars and user site, which
+    # trims startup; interpreters without -I (Python 2) get a plain retry
+    for args in (['-SI', '--version'], ['--version']):
         try:
-            # 3. Check for venv in current directory
-            environments.extend(self._detect_local_venv())
-        except Exception as e:
-            print(f"Warning: Local venv detection failed: {e}")
+            result = subprocess.run([real_path, *args],
+                                  capture_output=True, text=True, timeout=2)
+        except (subprocess.TimeoutExpired, OSError):
+            break
 
-        # Remove duplicates based on path (keep first occurrence)
-        seen_paths = set()
-        unique_environments = []
-        for env in environments:
-            if env['path'] not in seen_paths:
-                seen_paths.add(env['path'])
-                unique_environments.append(env)
+        if result.returncode == 0:
+            # Parse "Python 3.11.4" -> "3.11.4"
+            version_line = result.stdout.strip()
+            if version_line.startswith('Python '):
+                return version_line[7:]  # Remove "Python "
+            break
 
-        return sorted(unique_environments, key=lambda x: x['name'])
+    raise LookupError(f"Could not determine Python version for {real_path}")
 
-    def _detect_system_python(self) -> list[dict[str, str]]:
-        """Detect system Python installations"""
-        environments = []
 
-        # Common Python executable names
-        python_names = ['python3', 'python']
+class PythonEnvironmentDetector:
+    """Detects Python environments (system Python, conda and local venvs)"""
 
-        if self.system == 'windows':
-            python_names.extend(['py', 'python.exe'])
+    def detect_all_environments(self, refresh: bool = False) -> list[dict[str, str]]:
+        """Detect all Python environments on the system
 
-        for python_name in python_names:
-            try:
-                cmd = 'where' if self.system == 'windows' else 'which'
-                result = subprocess.run([cmd, python_name],
-                                      capture_output=True, text=True, timeout=5)
+        Returns the previous scan from ENV_CACHE_FILE if the directories
+        and interpreters it was built from are unchanged (same mtimes).
 
-                if result.returncode == 0:
-                    python_path = result.stdout.strip().split('\n')[0]
-                    version = self._get_python_version(python_path)
+        Args:
+            refresh: If True, ignore the on-disk cache and rescan
+        """
+        if not refresh:
+            cached = self._load_cached_environments()
+            if cached is not None:
+                return cached
 
+        environments = self._scan_all_environments()
+        self._save_cached_environments(environments)
+        return environments
+
+    def detect_fast_environments(
+        self,
+        callback: Callable[[list[dict[str, str]]], None] | None = None
+    ) -> list[dict[str, str]]:
+        """Return the current interpreter immediately, scanning the rest in the background
+
+        Needs no subprocess or filesystem scan, so a UI can render right
+        away. If a callback is given, detect_all_environments() runs in a
+        daemon thread and the callback receives its result. Only one
+        background scan runs at a time; callbacks registered while it is
+        running receive that scan's result.
+
+        Args:
+            callback: Called from the background thread with the full list
+
+        Returns:
+            List containing only the current environment
+        """
+        if callback is not None:
+            with _background_lock:
+                start_scan = not _background_callbacks
+                _background_callbacks.append(callback)
+            if start_scan:
+                threading.Thread(target=self._detect_in_background, daemon=True).start()
+        return [self.get_current_environment()]
+
+    def _detect_in_background(self) -> None:
+        """Thread target for detect_fast_environments"""
+        try:
+            environments = self.detect_all_environments()
+        except Exception as e:
+            print(f"Warning: Background environment detection failed: {e}")
+            environments = None
+        with _background_lock:
+            callbacks = _background_callbacks[:]
+            _background_callbacks.clear()
+        if environments is None:
+            return
+        for callback in callbacks:
+            try:
+                callback(environments)
+            except Exception as e:
+                print(f"Warning: Environment detection callback failed: {e}")
+
+    def _scan_all_environments(self) -> list[dict[str, str]]:
+        """Scan the system for Python environments, sorted by name"""
+        return sorted(self.iter_all_environments(), key=lambda x: x['name'])
+
+    def iter_all_environments(self) -> Iterator[dict[str, str]]:
+        """Scan the system for Python environments, yielding each as it is ready
+
+        Bypasses the on-disk cache. The detectors only find candidate
+        interpreters; they probe disjoint tools and paths, so they all run
+        concurrently in threads. As each detector's results come in (in
+        priority order), new interpreters get their versions resolved as one
+        concurrent batch and are yielded, so callers can show the first
+        environments before slow detectors finish. Output is unsorted.
+        """
+        # Listed in priority order: conda first for proper naming
+        detectors = [
+            ('Conda', self._detect_conda_environments),
+            ('System Python', self._detect_system_python),
+            ('Local venv', self._detect_local_venv),
+        ]
+
+        active_key = self._environment_key(sys.executable)
+        seen_keys = set()
+        versions = {}
+
+        with ThreadPoolExecutor(max_workers=len(detectors)) as detect_pool, \
+                ThreadPoolExecutor(max_workers=16) as version_pool:
+            futures = [(label, detect_pool.submit(detect)) for label, detect in detectors]
+
+            # Consume in priority order rather than completion order, so the
+            # dedup keeps the same entry as a sequential scan would
+            for label, future in futures:
+                try:
+                    candidates = future.result()
+                except Exception as e:
+                    print(f"Warning: {label} detection failed: {e}")
+                    continue
+
+                # Skip duplicates, treating symlinked aliases of one
+                # interpreter as the same environment
+                batch = []
+                for env in candidates:
+                    key = self._environment_key(env['path'])
+                    if key in seen_keys:
+                        continue
+                    seen_keys.add(key)
+                    env['active'] = key == active_key
+                    batch.append((env, os.path.realpath(env['path'])))
+
+                # Resolve each distinct interpreter once
+                pending = list(dict.fromkeys(real_path for _, real_path in batch if real_path not in versions))
+                versions.update(zip(pending, version_pool.map(self._get_python_version, pending)))
+
+                for env, real_path in batch:
+                    version = versions[real_path]
                     if version:
-                        environments.append({
-                            'name': f'System Python ({python_name})',
-                            'path': python_path,
-                            'version': version,
-                            'type': 'system',
-                            'active': python_path == sys.executable
-                        })
-
-            except (subprocess.TimeoutExpired, FileNotFoundError):
+                        env['version'] = version
+                        yield env
+
+    @staticmethod
+    def _environment_key(python_path: str) -> str:
+        """
+        Identify the environment an interpreter path runs in.
+
+        Aliases of the same binary share a key. Venvs are the exception:
+        their python symlinks to the base interpreter but has its own
+        site-packages, so a venv is keyed by its directory instead.
+
+        Args:
+            python_path: Path to a Python executable
+
+        Returns:
+            Realpath of the venv dir, or of the binary otherwise
+        """
+        env_dir = os.path.dirname(os.path.dirname(python_path))
+        if os.path.isfile(os.path.join(env_dir, 'pyvenv.cfg')):
+            return os.path.realpath(env_dir)
+        return os.path.realpath(python_path)
+
+    def _cache_manifest(self, environments: list[dict[str, str]]) -> dict[str, int | None]:
+        """
+        Map every path a scan result depends on to its current mtime.
+
+        Covers PATH entries (system Pythons), the working directory's
+        .venv/venv dirs, conda's environments.txt and envs dirs, and each
+        interpreter binary (so in-place upgrades change the manifest). The
+        working directory itself is left out: its mtime changes whenever a
+        notebook file is saved there, and only .venv/venv matter to the scan.
+
+        Args:
+            environments: Scan result the manifest is for
+
+        Returns:
+            Dict of path -> st_mtime_ns, or None for paths that don't exist
+        """
+        cwd = os.getcwd()
+        paths = [p for p in os.environ.get('PATH', '').split(os.pathsep) if p]
+        paths += [
+            os.path.join(cwd, '.venv'),
+            os.path.join(cwd, 'venv'),
+            os.path.join(os.path.expanduser('~'), '.conda', 'environments.txt'),
+        ]
+        for env in environments:
+            paths.append(os.path.realpath(env['path']))
+            if env['type'] == 'conda':
+                # New envs show up as new entries in <root>/envs
+                env_dir = os.path.dirname(os.path.dirname(env['path']))
+                paths.append(os.path.dirname(env_dir))
+                paths.append(os.path.join(env_dir, 'envs'))
+
+        manifest = {}
+        for path in paths:
+            try:
+                manifest[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                manifest[path] = None
+        return manifest
+
+    def _load_cached_environments(self) -> list[dict[str, str]] | None:
+        """Return the cached scan if it is still valid, else None."""
+        try:
+            with ENV_CACHE_FILE.open("r", encoding="utf-8") as f:
+                cached = json.load(f)
+            environments = cached['environments']
+            if cached['executable'] != sys.executable:
+                return None
+            if cached['manifest'] != self._cache_manifest(environments):
+                return None
+            return environments
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_cached_environments(self, environments: list[dict[str, str]]) -> None:
+        """Write a scan result to ENV_CACHE_FILE atomically (best effort)."""
+        data = {
+            'executable': sys.executable,
+            'manifest': self._cache_manifest(environments),
+            'environments': environments,
+        }
+        tmp_path = None
+        try:
+            ENV_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            # Unique temp name: a background scan and a full scan can save at once
+            fd, tmp_path = tempfile.mkstemp(
+                dir=ENV_CACHE_FILE.parent, prefix=ENV_CACHE_FILE.name, suffix='.tmp'
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, ENV_CACHE_FILE)
+        except OSError:
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def _detect_system_python(self) -> list[dict[str, str]]:
+        """Find system Python installations (version is filled in by the caller)
+
+        Walks PATH once, listing each directory with os.scandir and keeping
+        executables named like python, python3 or python3.11. Aliases that
+        resolve to the same binary are reported once, under the shortest
+        name in the earliest PATH directory. Version-manager shim dirs
+        only contribute their plain python/python3 entries.
+        """
+        environments = []
+        seen_real_paths = set()
+        executable_real_path = os.path.realpath(sys.executable)
+
+        for directory in dict.fromkeys(os.environ.get('PATH', '').split(os.pathsep)):
+            if not directory:
+                continue
+            try:
+                with os.scandir(directory) as it:
+                    entries = [entry for entry in it if _PYTHON_EXE_RE.match(entry.name)]
+            except OSError:
                 continue
 
+            if os.path.basename(directory) == 'shims':
+                # pyenv/asdf shims are wrapper scripts for every installed
+                # version; only the unversioned ones reflect the selected one
+                entries = [entry for entry in entries if entry.name in _SHIM_PYTHON_NAMES]
+
+            # Prefer python3 over python3.11 when both point at one binary
+            for entry in sorted(entries, key=lambda e: (len(e.name), e.name)):
+                try:
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                real_path = os.path.realpath(entry.path)
+                if real_path in seen_real_paths:
+                    continue
+                seen_real_paths.add(real_path)
+                environments.append({
+                    'name': f'System Python ({entry.name})',
+                    'path': entry.path,
+                    'type': 'system',
+                    'active': real_path == executable_real_path
+                })
+
+        if _IS_WINDOWS:
+            # The py launcher picks an installed Python itself
+            launcher = shutil.which('py')
+            if launcher:
+                environments.append({
+                    'name': 'System Python (py)',
+                    'path': launcher,
+                    'type': 'system',
+                    'active': False
+                })
+
         return environments
 
     def _detect_conda_environments(self) -> list[dict[str, str]]:
-        """Detect Conda/Mamba environments"""
+        """Find Conda/Mamba environments (version is filled in by the caller)"""
         environments = []
 
+        # Read conda's own env registry first; starting conda takes ~0.5s+
+        listing = self._read_conda_env_files() or self._run_conda_env_list()
+        if listing is None:
+            return environments
+
+        cmd, root_prefix, env_paths = listing
+        for env_path in env_paths:
+            python_path = self._find_python_in_env(env_path)
+            if python_path:
+                # Check if this is the base/root environment
+                if env_path == root_prefix:
+                    env_name = f'{cmd} (base)'
+                else:
+                    env_name = os.path.basename(env_path)
+
+                environments.append({
+                    'name': env_name,
+                    'path': python_path,
+                    'type': 'conda',
+                    'active': python_path == sys.executable
+                })
+
+        return environments
+
+    def _read_conda_env_files(self) -> tuple[str, str, list[str]] | None:
+        """
+        List conda envs from ~/.conda/environments.txt and the envs dirs.
+
+        This is the same registry `conda env list` reads. The root prefix
+        comes from CONDA_EXE (set by conda's shell hook), or else from the
+        listed prefix that has a condabin/ dir.
+
+        Returns:
+            (tool name, root prefix, env paths), or None if no conda install
+            could be found this way
+        """
+        home = os.path.expanduser('~')
+        env_paths = []
+        try:
+            with open(os.path.join(home, '.conda', 'environments.txt'), encoding='utf-8') as f:
+                env_paths = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        except OSError:
+            pass
+
+        root_prefix = ''
+        conda_exe = os.environ.get('CONDA_EXE')
+        if conda_exe:
+            # <root>/bin/conda, <root>/condabin/conda or <root>\Scripts\conda.exe
+            root_prefix = os.path.dirname(os.path.dirname(conda_exe))
+        else:
+            root_prefix = next((p for p in env_paths if os.path.isdir(os.path.join(p, 'condabin'))), '')
+
+        if not env_paths and not root_prefix:
+            return None
+
+        # Envs created under the default envs dirs may be missing from the file
+        envs_dirs = [os.path.join(home, '.conda', 'envs')]
+        if root_prefix:
+            env_paths.insert(0, root_prefix)
+            envs_dirs.insert(0, os.path.join(root_prefix, 'envs'))
+        for envs_dir in envs_dirs:
+            try:
+                with os.scandir(envs_dir) as it:
+                    env_paths.extend(entry.path for entry in it if entry.is_dir())
+            except OSError:
+                continue
+
+        return 'conda', root_prefix, list(dict.fromkeys(env_paths))
+
+    def _run_conda_env_list(self) -> tuple[str, str, list[str]] | None:
+        """
+        List conda envs by running `conda env list --json` (or mamba's).
+
+        Returns:
+            (tool name, root prefix, env paths), or None if neither tool ran
+        """
         # Try conda first, then mamba
         for cmd in ['conda', 'mamba']:
             try:
@@ -90,84 +481,84 @@ class PythonEnvironmentDetector:
 
                 if result.returncode == 0:
                     data = json.loads(result.stdout)
-                    root_prefix = data.get('root_prefix', '')
-
-                    for env_path in data.get('envs', []):
-                        # Find python in conda env
-                        env_path_obj = Path(env_path)
-                        if self.system == 'windows':
-                            python_path = env_path_obj / 'python.exe'
-                        else:
-                            python_path = env_path_obj / 'bin' / 'python'
-
-                        if python_path.exists() and python_path.is_file():
-                            # Check if this is the base/root environment
-                            if env_path == root_prefix:
-                                env_name = f'{cmd} (base)'
-                            else:
-                                env_name = os.path.basename(env_path)
-
-                            version = self._get_python_version(str(python_path))
-                            if version:
-                                environments.append({
-                                    'name': env_name,
-                                    'path': str(python_path),
-                                    'version': version,
-                                    'type': 'conda',
-                                    'active': str(python_path) == sys.executable
-                                })
-                    break
+                    return cmd, data.get('root_prefix', ''), data.get('envs', [])
 
             except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError):
                 continue
 
-        return environments
+        return None
 
     def _detect_local_venv(self) -> list[dict[str, str]]:
-        """Detect virtual environments in current directory only"""
+        """Find virtual environments in current directory only (version is filled in by the caller)"""
         environments = []
 
         # Only check common venv names in current directory
         venv_names = ['.venv', 'venv']
+        cwd = os.getcwd()
 
         for venv_name in venv_names:
-            venv_path = Path.cwd() / venv_name
-            if venv_path.exists() and venv_path.is_dir():
-                # Find python executable
-                if self.system == 'windows':
-                    python_path = venv_path / 'Scripts' / 'python.exe'
-                else:
-                    python_path = venv_path / 'bin' / 'python'
-
-                if python_path.exists() and python_path.is_file():
-                    version = self._get_python_version(str(python_path))
-                    if version:
-                        environments.append({
-                            'name': venv_name,
-                            'path': str(python_path),
-                            'version': version,
-                            'type': 'venv',
-                            'active': str(python_path) == sys.executable
-                        })
+            python_path = self._find_python_in_env(os.path.join(cwd, venv_name))
+            if python_path:
+                environments.append({
+                    'name': venv_name,
+                    'path': python_path,
+                    'type': 'venv',
+                    'active': python_path == sys.executable
+                })
 
         return environments
 
-    def _get_python_version(self, python_path: str) -> str | None:
-        """Get Python version from executable"""
+    def _find_python_in_env(self, env_path: str) -> str | None:
+        """Locate an environment's interpreter
+
+        The interpreter itself is the decisive indicator, so each candidate
+        layout costs a single stat (which also fails if env_path is missing)
+        instead of separate exists/is_dir/is_file probes. If bin/python is
+        absent, bin/ is listed once and matched against _PYTHON_EXE_RE.
+
+        Args:
+            env_path: Environment root (conda prefix or venv dir)
+
+        Returns:
+            Path to the interpreter, or None if this is not an environment
+        """
+        join = os.path.join
+        isfile = os.path.isfile
+        for subpath in _ENV_PYTHON_SUBPATHS:
+            python_path = join(env_path, subpath)
+            if isfile(python_path):
+                return python_path
+
+        if _IS_WINDOWS:
+            return None
+
+        # Some envs only ship versioned names (python3, python3.12); list bin/
+        # once and take the shortest matching name
+        bin_dir = os.path.join(env_path, 'bin')
         try:
-            result = subprocess.run([python_path, '--version'],
-                                  capture_output=True, text=True, timeout=5)
+            with os.scandir(bin_dir) as it:
+                names = [entry.name for entry in it if _PYTHON_EXE_RE.match(entry.name) and entry.is_file()]
+        except OSError:
+            return None
+        if not names:
+            return None
+        return os.path.join(bin_dir, min(names, key=lambda name: (len(name), name)))
 
-            if result.returncode == 0:
-                # Parse "Python 3.11.4" -> "3.11.4"
-                version_line = result.stdout.strip()
-                if version_line.startswith('Python '):
-                    return version_line[7:]  # Remove "Python "
+    def _get_python_version(self, python_path: str) -> str | None:
+        """Get Python version from executable
 
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+        Results are memoized per resolved binary (see _resolve_python_version),
+        so symlinked aliases of the same interpreter are only probed once.
+        """
+        real_path = os.path.realpath(python_path)
+        if real_path == os.path.realpath(sys.executable):
+            return f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
 
-        return None
+        try:
+            # The mtime changes when the interpreter is upgraded in place
+            return _resolve_python_version(real_path, os.stat(real_path).st_mtime_ns)
+        except (OSError, LookupError):
+            return None
 
     def get_current_environment(self) -> dict[str, str]:
         """Get information about the currently active Python environment"""
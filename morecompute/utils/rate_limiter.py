@@ -0,0 +1,88 @@
+"""Async rate limiting helpers for outbound API requests."""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Token-bucket rate limiter for asyncio code.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each ``acquire()`` takes one token, waiting if none are available.
+    Servers that advertise their remaining quota can re-tune the bucket via
+    ``retune()``, and ``pause()`` blocks all callers until a deadline (e.g.
+    after a 429 with Retry-After).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Block all acquirers for at least ``seconds``."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def retune(self, remaining: int | None = None, reset_after: float | None = None) -> None:
+        """Align the bucket with quota information reported by the server.
+
+        Args:
+            remaining: Requests the server says are left in the current window
+            reset_after: Seconds until the server's window resets
+        """
+        if remaining is not None:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, float(remaining))
+            if remaining <= 0 and reset_after:
+                self.pause(reset_after)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After / X-RateLimit-Reset header value into seconds.
+
+    Accepts delta-seconds, or a Unix timestamp (as some APIs send for the
+    reset header). HTTP-date values are not supported and return None.
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Seconds to wait, or None if the value is missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if seconds > 1e9:  # Absolute epoch timestamp
+        seconds -= time.time()
+    return max(seconds, 0.0)
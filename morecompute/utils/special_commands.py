@@ -1,22 +1,83 @@
 import os
+import re
+import codecs
 import asyncio
 import subprocess
 import time
 import shlex
 from typing import Dict, Any, Optional, Union
 from fastapi import WebSocket
+from fastapi.websockets import WebSocketState
 
 from .cell_magics import CellMagicHandlers
 from .line_magics import LineMagicHandlers
 from .shell_utils import prepare_shell_command, prepare_shell_environment
+from .json_util import json_dumps
 
 
 # this file is not tested that all functions work, need to write a test file / manually check
 # to-do
 
+# A cell is special if it starts with a magic (% / %%) or shell command (!), or if
+# ANY line is a shell command (like Jupyter/Colab), which allows mixing Python
+# code with !commands. One regex pass instead of strip/split per line.
+_SPECIAL_RE = re.compile(r'\A\s*%|^\s*!', re.MULTILINE)
+
+
+async def _send_json(websocket: WebSocket, message: Dict[str, Any]) -> None:
+    """Send a message as a JSON text frame, encoded with json_dumps (orjson when installed)"""
+    await websocket.send_text(json_dumps(message).decode())
+
+
+def _fast_tokenize(line: str) -> list:
+    """Split a magic line like shlex.split, skipping shlex when there is nothing to unquote"""
+    if '"' in line or "'" in line or '\\' in line:
+        return shlex.split(line)
+    return line.split()
+
+
 class AsyncSpecialCommandHandler:
     """Handles all special commands asynchronously with streaming support: shell (!), line magics (%), and cell magics (%%)"""
 
+    STREAM_READ_SIZE = 65536  # Max bytes per pipe read
+    STREAM_BUFFER_LIMIT = 1 << 20  # StreamReader buffer limit for subprocess pipes
+    STREAM_FLUSH_INTERVAL = 0.025  # Max seconds output waits before being sent
+    STREAM_FLUSH_BYTES = 16_384  # Send early once this much output is pending
+    STREAM_QUEUE_SIZE = 64  # Chunks buffered between reader and sender
+
+    # Cell magic name -> (handler method, takes magic args, takes execution count)
+    _CELL_MAGICS = {
+        "capture": (CellMagicHandlers.handle_capture, True, True),
+        "time": (CellMagicHandlers.handle_time, False, True),
+        "timeit": (CellMagicHandlers.handle_timeit, True, True),
+        "writefile": (CellMagicHandlers.handle_writefile, True, False),
+        "bash": (CellMagicHandlers.handle_bash, False, False),
+        "sh": (CellMagicHandlers.handle_bash, False, False),
+        "html": (CellMagicHandlers.handle_html, False, False),
+        "markdown": (CellMagicHandlers.handle_markdown, False, False),
+    }
+
+    # Line magic name -> handler method taking (args, result, websocket)
+    _LINE_MAGICS = {
+        "pwd": LineMagicHandlers.handle_pwd,
+        "cd": LineMagicHandlers.handle_cd,
+        "ls": LineMagicHandlers.handle_ls,
+        "env": LineMagicHandlers.handle_env,
+        "who": LineMagicHandlers.handle_who,
+        "whos": LineMagicHandlers.handle_whos,
+        "time": LineMagicHandlers.handle_time,
+        "timeit": LineMagicHandlers.handle_timeit,
+        "pip": LineMagicHandlers.handle_pip,
+        "load": LineMagicHandlers.handle_load,
+        "reset": LineMagicHandlers.handle_reset,
+        "lsmagic": LineMagicHandlers.handle_lsmagic,
+        "matplotlib": LineMagicHandlers.handle_matplotlib,
+        "load_ext": LineMagicHandlers.handle_load_ext,
+        "reload_ext": LineMagicHandlers.handle_reload_ext,
+        "unload_ext": LineMagicHandlers.handle_unload_ext,
+        "run": LineMagicHandlers.handle_run,
+    }
+
     def __init__(self, globals_dict: dict):
         self.globals_dict = globals_dict
         self.captured_outputs = {}  # Store captured outputs from %%capture
@@ -29,29 +90,13 @@ class AsyncSpecialCommandHandler:
 
     def is_special_command(self, source_code: Union[str, list, tuple]) -> bool:
         """Check if the source code is a special command or contains shell commands"""
-        text = self._coerce_source_to_text(source_code)
-        stripped = text.strip()
-
-        # Check if starts with magic or shell command
-        if (stripped.startswith('!') or
-            stripped.startswith('%%') or
-            stripped.startswith('%')):
-            return True
-
-        # Check if ANY line contains a shell command (like Jupyter/Colab)
-        # This allows mixing Python code with !commands
-        lines = text.split('\n')
-        for line in lines:
-            if line.strip().startswith('!'):
-                return True
-
-        return False
+        return _SPECIAL_RE.search(self._coerce_source_to_text(source_code)) is not None
 
     async def execute_special_command(self, source_code: Union[str, list, tuple], result: Dict[str, Any],
                                     start_time: float, execution_count: int,
                                     websocket: Optional[WebSocket] = None,
                                     cell_index: Optional[int] = None) -> Dict[str, Any]:
-        """Execute a special command and return the result"""
+        """Execute a special command and return the result (start_time is a time.perf_counter() reading)"""
         # Reset interrupt flag at start of execution
         self.sync_interrupted = False
 
@@ -83,11 +128,18 @@ class AsyncSpecialCommandHandler:
             }
 
         # Calculate execution time
-        result["execution_time"] = f"{(time.time() - start_time) * 1000:.1f}ms"
+        result["execution_time"] = f"{(time.perf_counter() - start_time) * 1000:.1f}ms"
         return result
 
-    def _coerce_source_to_text(self, source_code: Union[str, list, tuple]) -> str:
+    @staticmethod
+    def _coerce_source_to_text(source_code: Union[str, list, tuple]) -> str:
         """Normalize incoming source to a single text string"""
+        # Exact-type fast paths: already-normalized text is returned as-is
+        source_type = type(source_code)
+        if source_type is str:
+            return source_code
+        if source_type is list or source_type is tuple:
+            return "".join(source_code)
         try:
             if isinstance(source_code, str):
                 return source_code
@@ -115,19 +167,25 @@ class AsyncSpecialCommandHandler:
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 env=env,
-                cwd=os.getcwd()
+                cwd=os.getcwd(),
+                limit=self.STREAM_BUFFER_LIMIT
             )
 
             # Track process for interrupt handling
             self.current_process = process
 
+            # Pre-create the stream outputs so each reader fills its own entry directly
+            stdout_output = {"output_type": "stream", "name": "stdout", "text": ""}
+            stderr_output = {"output_type": "stream", "name": "stderr", "text": ""}
+            result["outputs"].extend((stdout_output, stderr_output))
+
             try:
                 # Stream output concurrently
                 stdout_task = asyncio.create_task(
-                    self._stream_output(process.stdout, "stdout", result, websocket, cell_index)
+                    self._stream_output(process.stdout, "stdout", stdout_output, websocket, cell_index)
                 )
                 stderr_task = asyncio.create_task(
-                    self._stream_output(process.stderr, "stderr", result, websocket, cell_index)
+                    self._stream_output(process.stderr, "stderr", stderr_output, websocket, cell_index)
                 )
 
                 # Track tasks for interruption
@@ -156,6 +214,10 @@ class AsyncSpecialCommandHandler:
                 # Clear process reference when done
                 self.current_process = None
                 self.stream_tasks = []
+                # Drop streams that produced no output
+                for output in (stdout_output, stderr_output):
+                    if not output["text"]:
+                        result["outputs"].remove(output)
 
             # Check if process was interrupted (negative return code means killed by signal)
             if return_code < 0:
@@ -178,10 +240,10 @@ class AsyncSpecialCommandHandler:
 
             # If pip install/uninstall occurred, notify clients to refresh packages
             try:
-                if websocket and return_code == 0 and (command.startswith('pip install') or command.startswith('pip uninstall') or 'pip install' in command or 'pip uninstall' in command):
+                if websocket and return_code == 0 and ('pip install' in command or 'pip uninstall' in command):
                     # Small delay to ensure pip finishes writing metadata to disk
                     await asyncio.sleep(0.5)
-                    await websocket.send_json({
+                    await _send_json(websocket, {
                         "type": "packages_updated",
                         "data": {"action": "pip"}
                     })
@@ -197,7 +259,7 @@ class AsyncSpecialCommandHandler:
             }
 
             if websocket:
-                await websocket.send_json({
+                await _send_json(websocket, {
                     "type": "execution_error",
                     "data": {
                         "error": result["error"]
@@ -205,7 +267,7 @@ class AsyncSpecialCommandHandler:
                 })
 
         # Calculate execution time
-        result["execution_time"] = f"{(time.time() - start_time) * 1000:.1f}ms"
+        result["execution_time"] = f"{(time.perf_counter() - start_time) * 1000:.1f}ms"
         return result
 
     async def interrupt(self):
@@ -248,59 +310,122 @@ class AsyncSpecialCommandHandler:
             except Exception:
                 pass
 
-    async def _stream_output(self, stream, stream_type: str, result: Dict[str, Any],
+    async def _stream_output(self, stream, stream_type: str, output: Dict[str, Any],
                            websocket: Optional[WebSocket] = None,
                            cell_index: Optional[int] = None):
-        """Read from a stream and send to websocket, while capturing the output."""
+        """Read from a stream and send to websocket, capturing the text into ``output``.
+
+        The pipe is drained in STREAM_READ_SIZE chunks and the decoded text is
+        handed to a sender task that coalesces them into one stream_output
+        frame per STREAM_FLUSH_INTERVAL (or STREAM_FLUSH_BYTES). The queue in
+        between is bounded, so a slow client stalls the reader - and the
+        subprocess behind the pipe - instead of buffering without limit.
+        """
+        captured: list[str] = []
+        queue: Optional[asyncio.Queue] = None
+        sender: Optional[asyncio.Task] = None
+        if websocket:
+            queue = asyncio.Queue(maxsize=self.STREAM_QUEUE_SIZE)
+            sender = asyncio.create_task(
+                self._send_stream_batches(queue, websocket, stream_type, cell_index)
+            )
 
-        output_text = ""
+        # One decoder per stream carries multibyte characters split across reads
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        interrupted = False
+        error_message = None
         while True:
             try:
-                line = await stream.readline()
-                if not line:
+                chunk = await stream.read(self.STREAM_READ_SIZE)
+                text = decoder.decode(chunk, final=not chunk)
+                if text:
+                    captured.append(text)
+                    if queue is not None:
+                        await queue.put(text)
+                if not chunk:
                     break
-
-                decoded_line = line.decode('utf-8')
-                output_text += decoded_line
-
-                if websocket:
-                    await websocket.send_json({
-                        "type": "stream_output",
-                        "data": {
-                            "stream": stream_type,
-                            "text": decoded_line,
-                            **({"cell_index": cell_index} if cell_index is not None else {})
-                        }
-                    })
             except asyncio.CancelledError:
+                interrupted = True
                 break
             except Exception as e:
                 # Handle potential errors during streaming
                 error_message = f"Error reading stream: {e}\n"
-                output_text += error_message
-                if websocket:
-                    await websocket.send_json({
-                        "type": "stream_output",
-                        "data": {
-                            "stream": "stderr",
-                            "text": error_message,
-                            **({"cell_index": cell_index} if cell_index is not None else {})
-                        }
-                    })
+                captured.append(error_message)
                 break
 
-        # Add the captured text to the final result object
-        if output_text:
-            # Look for an existing stream output of the same type to append to
-            existing_output = next((o for o in result["outputs"] if o.get("name") == stream_type), None)
-            if existing_output:
-                existing_output["text"] += output_text
+        if sender is not None:
+            if interrupted:
+                sender.cancel()
             else:
-                result["outputs"].append({
-                    "output_type": "stream",
-                    "name": stream_type,
-                    "text": output_text
+                await queue.put(None)
+                await sender
+
+        if error_message and websocket:
+            try:
+                await _send_json(websocket, {
+                    "type": "stream_output",
+                    "data": {
+                        "stream": "stderr",
+                        "text": error_message,
+                        **({"cell_index": cell_index} if cell_index is not None else {})
+                    }
                 })
+            except Exception:
+                pass
+
+        output["text"] += "".join(captured)
+
+    async def _send_stream_batches(self, queue: asyncio.Queue, websocket: WebSocket,
+                                   stream_type: str, cell_index: Optional[int] = None):
+        """Coalesce queued text into stream_output frames until a None sentinel arrives."""
+        loop = asyncio.get_running_loop()
+        # The envelope is fixed for the whole stream; only the text is encoded per frame
+        envelope = '{"type":"stream_output","data":{"stream":' + json_dumps(stream_type).decode()
+        if cell_index is not None:
+            envelope += ',"cell_index":' + json_dumps(cell_index).decode()
+        envelope += ',"text":'
+        pending: list[str] = []
+        pending_bytes = 0
+        deadline = 0.0
+
+        async def flush():
+            nonlocal websocket, pending_bytes
+            text = "".join(pending)
+            pending.clear()
+            pending_bytes = 0
+            if websocket is None or websocket.client_state != WebSocketState.CONNECTED:
+                return
+            try:
+                await websocket.send_text(envelope + json_dumps(text).decode() + '}}')
+            except Exception:
+                # Keep draining the queue so the reader never blocks on a dead client
+                websocket = None
+
+        while True:
+            if pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    await flush()
+                    continue
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    await flush()
+                    continue
+            else:
+                item = await queue.get()
+
+            if item is None:
+                if pending:
+                    await flush()
+                return
+
+            if not pending:
+                deadline = loop.time() + self.STREAM_FLUSH_INTERVAL
+            pending.append(item)
+            pending_bytes += len(item)
+            if pending_bytes >= self.STREAM_FLUSH_BYTES:
+                await flush()
 
     async def _execute_cell_magic(self, source_code: str, result: Dict[str, Any],
                                  start_time: float, execution_count: int,
@@ -311,41 +436,22 @@ class AsyncSpecialCommandHandler:
         cell_content = '\n'.join(lines[1:]) if len(lines) > 1 else ""
 
         # Parse magic command and arguments
-        magic_parts = shlex.split(magic_line)
+        magic_parts = _fast_tokenize(magic_line)
         magic_name = magic_parts[0][2:]  # Remove %%
         magic_args = magic_parts[1:] if len(magic_parts) > 1 else []
 
-        # Map magic names to handler methods
-        magic_handlers = {
-            "capture": lambda: self.cell_magic_handlers.handle_capture(
-                magic_args, cell_content, result, start_time, execution_count, websocket
-            ),
-            "time": lambda: self.cell_magic_handlers.handle_time(
-                cell_content, result, start_time, execution_count, websocket
-            ),
-            "timeit": lambda: self.cell_magic_handlers.handle_timeit(
-                magic_args, cell_content, result, start_time, execution_count, websocket
-            ),
-            "writefile": lambda: self.cell_magic_handlers.handle_writefile(
-                magic_args, cell_content, result, start_time, websocket
-            ),
-            "bash": lambda: self.cell_magic_handlers.handle_bash(
-                cell_content, result, start_time, websocket
-            ),
-            "sh": lambda: self.cell_magic_handlers.handle_bash(
-                cell_content, result, start_time, websocket
-            ),
-            "html": lambda: self.cell_magic_handlers.handle_html(
-                cell_content, result, start_time, websocket
-            ),
-            "markdown": lambda: self.cell_magic_handlers.handle_markdown(
-                cell_content, result, start_time, websocket
-            ),
-        }
-
         try:
-            if magic_name in magic_handlers:
-                return await magic_handlers[magic_name]()
+            spec = self._CELL_MAGICS.get(magic_name)
+            if spec is not None:
+                method, takes_args, takes_count = spec
+                handlers = self.cell_magic_handlers
+                if takes_args and takes_count:
+                    return await method(handlers, magic_args, cell_content, result, start_time, execution_count, websocket)
+                if takes_args:
+                    return await method(handlers, magic_args, cell_content, result, start_time, websocket)
+                if takes_count:
+                    return await method(handlers, cell_content, result, start_time, execution_count, websocket)
+                return await method(handlers, cell_content, result, start_time, websocket)
             else:
                 result["status"] = "error"
                 result["error"] = {
@@ -355,7 +461,7 @@ class AsyncSpecialCommandHandler:
                 }
 
                 if websocket:
-                    await websocket.send_json({
+                    await _send_json(websocket, {
                         "type": "execution_error",
                         "data": {
                             "error": result["error"]
@@ -370,48 +476,31 @@ class AsyncSpecialCommandHandler:
             }
 
             if websocket:
-                await websocket.send_json({
+                await _send_json(websocket, {
                     "type": "execution_error",
                     "data": {
                         "error": result["error"]
                     }
                 })
 
-        result["execution_time"] = f"{(time.time() - start_time) * 1000:.1f}ms"
+        result["execution_time"] = f"{(time.perf_counter() - start_time) * 1000:.1f}ms"
         return result
 
     async def _execute_line_magic(self, magic_line: str, result: Dict[str, Any],
                                 start_time: float, websocket: Optional[WebSocket] = None) -> Dict[str, Any]:
         """Execute a line magic command"""
         # Parse magic command and arguments
-        parts = shlex.split(magic_line)
+        parts = _fast_tokenize(magic_line)
         magic_name = parts[0]
         magic_args = parts[1:] if len(parts) > 1 else []
 
-        # Map magic names to handler methods
-        magic_handlers = {
-            "pwd": lambda: self.line_magic_handlers.handle_pwd(magic_args, result, websocket),
-            "cd": lambda: self.line_magic_handlers.handle_cd(magic_args, result, websocket),
-            "ls": lambda: self.line_magic_handlers.handle_ls(magic_args, result, websocket),
-            "env": lambda: self.line_magic_handlers.handle_env(magic_args, result, websocket),
-            "who": lambda: self.line_magic_handlers.handle_who(magic_args, result, websocket),
-            "whos": lambda: self.line_magic_handlers.handle_whos(magic_args, result, websocket),
-            "time": lambda: self.line_magic_handlers.handle_time(magic_args, result, websocket),
-            "timeit": lambda: self.line_magic_handlers.handle_timeit(magic_args, result, websocket),
-            "pip": lambda: self.line_magic_handlers.handle_pip(magic_args, result, self, websocket),
-            "load": lambda: self.line_magic_handlers.handle_load(magic_args, result, websocket),
-            "reset": lambda: self.line_magic_handlers.handle_reset(magic_args, result, websocket),
-            "lsmagic": lambda: self.line_magic_handlers.handle_lsmagic(magic_args, result, websocket),
-            "matplotlib": lambda: self.line_magic_handlers.handle_matplotlib(magic_args, result, websocket),
-            "load_ext": lambda: self.line_magic_handlers.handle_load_ext(magic_args, result, websocket),
-            "reload_ext": lambda: self.line_magic_handlers.handle_reload_ext(magic_args, result, websocket),
-            "unload_ext": lambda: self.line_magic_handlers.handle_unload_ext(magic_args, result, websocket),
-            "run": lambda: self.line_magic_handlers.handle_run(magic_args, result, websocket),
-        }
-
         try:
-            if magic_name in magic_handlers:
-                return await magic_handlers[magic_name]()
+            method = self._LINE_MAGICS.get(magic_name)
+            if method is LineMagicHandlers.handle_pip:
+                # %pip runs through this handler's shell streaming
+                return await method(self.line_magic_handlers, magic_args, result, self, websocket)
+            if method is not None:
+                return await method(self.line_magic_handlers, magic_args, result, websocket)
             else:
                 result["status"] = "error"
                 result["error"] = {
@@ -421,7 +510,7 @@ class AsyncSpecialCommandHandler:
                 }
 
                 if websocket:
-                    await websocket.send_json({
+                    await _send_json(websocket, {
                         "type": "execution_error",
                         "data": {
                             "error": result["error"]
@@ -436,12 +525,12 @@ class AsyncSpecialCommandHandler:
             }
 
             if websocket:
-                await websocket.send_json({
+                await _send_json(websocket, {
                     "type": "execution_error",
                     "data": {
                         "error": result["error"]
                     }
                 })
 
-        result["execution_time"] = f"{(time.time() - start_time) * 1000:.1f}ms"
+        result["execution_time"] = f"{(time.perf_counter() - start_time) * 1000:.1f}ms"
         return result
@@ -2,60 +2,108 @@
 Version checking utility - notifies users when a newer version is available.
 """
 
-import json
+import os
+import re
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
+from .json_util import json_loads
+
 # Check at most once per day
 CHECK_INTERVAL_SECONDS = 86400  # 24 hours
-CACHE_FILE = Path.home() / ".cache" / "morecompute" / "version_check.json"
-PYPI_URL = "https://pypi.org/pypi/more-compute/json"
+CACHE_FILE = Path.home() / ".cache" / "morecompute" / "version_check"
+# PEP 691 JSON simple index: a file listing plus "versions", without the README
+# and per-release metadata the /pypi/<project>/json endpoint carries
+PYPI_URL = "https://pypi.org/simple/more-compute/"
+PYPI_ACCEPT = "application/vnd.pypi.simple.v1+json"
+_RELEASE_VERSION_RE = re.compile(r"^\d+(?:\.\d+)*(?:\.post\d+)?$")
+_VERSION_PART_RE = re.compile(r"\d+")
+
+# Set once the cache directory is known to exist
+_CACHE_DIR_READY = False
+
+# Result of the last check in this process
+_MEM_CACHE = {"version": None, "checked_at": 0.0, "result": None}
 
 
 def _get_cache() -> dict:
     """Read the version check cache."""
     try:
-        if CACHE_FILE.exists():
-            return json.loads(CACHE_FILE.read_text())
+        # Single line: "<last_check> [<latest_version>]"
+        fields = CACHE_FILE.read_text().split()
+        return {
+            "last_check": float(fields[0]),
+            "latest_version": fields[1] if len(fields) > 1 else None,
+        }
     except Exception:
         pass
     return {}
 
 
+def _cache_mtime() -> float:
+    """Return the cache file's mtime, or 0 if it doesn't exist."""
+    try:
+        return CACHE_FILE.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
 def _save_cache(data: dict) -> None:
-    """Save the version check cache."""
+    """
+    Save the version check cache.
+
+    Writes a temp file and renames it over the cache, so an interrupted
+    write can't leave a torn file that forces the next run to re-fetch.
+    """
+    global _CACHE_DIR_READY
+    tmp_file = CACHE_FILE.with_name(CACHE_FILE.name + ".tmp")
     try:
-        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        CACHE_FILE.write_text(json.dumps(data))
+        if not _CACHE_DIR_READY:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _CACHE_DIR_READY = True
+        tmp_file.write_text(f"{int(data['last_check'])} {data.get('latest_version') or ''}\n")
+        os.replace(tmp_file, CACHE_FILE)
     except Exception:
-        pass  # Don't fail if we can't cache
+        tmp_file.unlink(missing_ok=True)  # Don't fail if we can't cache
 
 
+@lru_cache(maxsize=64)
 def _parse_version(version: str) -> Tuple[int, ...]:
     """Parse version string into tuple for comparison."""
     try:
         # Handle versions like "0.4.4" or "0.4.4.post1"
         parts = version.split(".")
-        return tuple(int(p.split("-")[0].split("a")[0].split("b")[0].split("post")[0]) 
-                     for p in parts[:3])
+        return tuple(int(_VERSION_PART_RE.match(p).group()) for p in parts[:3])
     except Exception:
         return (0, 0, 0)
 
 
+def _is_newer(latest: str, current: str) -> bool:
+    """Return True if latest is a newer version than current."""
+    # Nearly every run is already up to date, so skip parsing on an exact match
+    return latest != current and _parse_version(latest) > _parse_version(current)
+
+
 def _fetch_latest_version() -> Optional[str]:
-    """Fetch the latest version from PyPI."""
+    """Fetch the latest release version from PyPI's simple index."""
     try:
+        import gzip
         import urllib.request
-        import json as json_module
-        
+
         request = urllib.request.Request(
             PYPI_URL,
-            headers={"Accept": "application/json"}
+            headers={"Accept": PYPI_ACCEPT, "Accept-Encoding": "gzip"}
         )
         with urllib.request.urlopen(request, timeout=3.0) as response:
-            data = json_module.loads(response.read().decode())
-            return data.get("info", {}).get("version")
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+        # Skip pre-releases and dev builds, matching what /pypi/<project>/json reports
+        releases = [v for v in json_loads(body).get("versions", []) if _RELEASE_VERSION_RE.match(v)]
+        if releases:
+            return max(releases, key=_parse_version)
     except Exception:
         pass  # Network errors are fine, just skip the check
     return None
@@ -72,33 +120,46 @@ def check_for_updates(current_version: str, force: bool = False) -> Optional[str
     Returns:
         A message string if an update is available, None otherwise
     """
-    cache = _get_cache()
     now = time.time()
-    
-    # Check if we should skip (already checked recently)
-    if not force:
+
+    # Reuse the last in-process answer while it is still fresh
+    if (not force and _MEM_CACHE["version"] == current_version
+            and now - _MEM_CACHE["checked_at"] < CHECK_INTERVAL_SECONDS):
+        return _MEM_CACHE["result"]
+
+    cache = {}
+
+    # Check if we should skip (already checked recently). The cache file is
+    # rewritten on every check, so a stale mtime means it isn't worth reading.
+    if not force and now - _cache_mtime() < CHECK_INTERVAL_SECONDS:
+        cache = _get_cache()
         last_check = cache.get("last_check", 0)
         if now - last_check < CHECK_INTERVAL_SECONDS:
             # Use cached result
             latest = cache.get("latest_version")
-            if latest and _parse_version(latest) > _parse_version(current_version):
-                return _format_update_message(current_version, latest)
-            return None
-    
+            return _remember(current_version, now, latest)
+
     # Fetch from PyPI
     latest = _fetch_latest_version()
-    
-    # Update cache
+
+    # Update cache, keeping the last known version if PyPI was unreachable
+    if not latest and not cache:
+        cache = _get_cache()
     cache["last_check"] = now
     if latest:
         cache["latest_version"] = latest
     _save_cache(cache)
-    
-    # Compare versions
-    if latest and _parse_version(latest) > _parse_version(current_version):
-        return _format_update_message(current_version, latest)
-    
-    return None
+
+    return _remember(current_version, now, latest)
+
+
+def _remember(current_version: str, now: float, latest: Optional[str]) -> Optional[str]:
+    """Compare versions and memoize the resulting message for this process."""
+    result = None
+    if latest and _is_newer(latest, current_version):
+        result = _format_update_message(current_version, latest)
+    _MEM_CACHE.update(version=current_version, checked_at=now, result=result)
+    return result
 
 
 def _format_update_message(current: str, latest: str) -> str:
@@ -3,6 +3,21 @@
 import zmq
 import os
 
+# Queue depth for worker output on the SUB socket. Remote workers publish over
+# a tunnel whose latency makes output arrive in bursts, so allow a deeper queue
+# there; locally keep ZMQ's default to limit client memory.
+REMOTE_SUB_RCVHWM = 100_000
+LOCAL_SUB_RCVHWM = 1000
+
+
+def _configure_socket(sock: zmq.Socket) -> None:
+    """Apply shared link options: no linger on close, TCP keepalive, fast reconnect."""
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.setsockopt(zmq.TCP_KEEPALIVE, 1)
+    sock.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 30)
+    sock.setsockopt(zmq.RECONNECT_IVL, 100)
+    sock.setsockopt(zmq.RECONNECT_IVL_MAX, 5000)
+
 
 def reconnect_zmq_sockets(
     executor: any,
@@ -19,6 +34,8 @@ def reconnect_zmq_sockets(
         pub_addr: Publish socket address (defaults to local)
         is_remote: True if connecting to remote worker, False for local
     """
+    old_pub_addr = getattr(executor, 'pub_addr', None)
+
     # Use provided addresses or fall back to defaults
     final_cmd_addr = cmd_addr or os.getenv('MC_ZMQ_CMD_ADDR', 'tcp://127.0.0.1:5555')
     final_pub_addr = pub_addr or os.getenv('MC_ZMQ_PUB_ADDR', 'tcp://127.0.0.1:5556')
@@ -28,18 +45,57 @@ def reconnect_zmq_sockets(
     executor.pub_addr = final_pub_addr
     executor.is_remote = is_remote
 
-    # Reconnect command socket (REQ)
+    # Reconnect command socket (REQ). Always recreated: a REQ socket's
+    # send/recv state survives disconnect, so one left mid-request by the old
+    # worker would refuse the next send.
     executor.req.close(0)  # type: ignore[reportAttributeAccessIssue]
     executor.req = executor.ctx.socket(zmq.REQ)  # type: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
+    _configure_socket(executor.req)  # type: ignore[reportAttributeAccessIssue]
     executor.req.connect(executor.cmd_addr)  # type: ignore[reportAttributeAccessIssue]
 
-    # Reconnect publish socket (SUB)
+    # Reconnect publish socket (SUB) in place; the subscription survives
+    # disconnect, so only fall back to a fresh socket if that fails.
+    # Options are set before connecting so they apply to the new connection.
+    sub_hwm = REMOTE_SUB_RCVHWM if is_remote else LOCAL_SUB_RCVHWM
+    _configure_socket(executor.sub)  # type: ignore[reportAttributeAccessIssue]
+    executor.sub.setsockopt(zmq.RCVHWM, sub_hwm)  # type: ignore[reportAttributeAccessIssue]
+    if old_pub_addr and _move_socket(executor.sub, old_pub_addr, executor.pub_addr):  # type: ignore[reportAttributeAccessIssue]
+        return
     executor.sub.close(0)  # type: ignore[reportAttributeAccessIssue]
     executor.sub = executor.ctx.socket(zmq.SUB)  # type: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
+    _configure_socket(executor.sub)  # type: ignore[reportAttributeAccessIssue]
+    executor.sub.setsockopt(zmq.RCVHWM, sub_hwm)  # type: ignore[reportAttributeAccessIssue]
     executor.sub.connect(executor.pub_addr)  # type: ignore[reportAttributeAccessIssue]
     executor.sub.setsockopt_string(zmq.SUBSCRIBE, '')  # type: ignore[reportAttributeAccessIssue]
 
 
+def _move_socket(sock: zmq.Socket, old_addr: str, new_addr: str) -> bool:
+    """
+    Disconnect a socket from old_addr and connect it to new_addr.
+
+    Messages already queued from the old peer are discarded so they can't be
+    mistaken for output from the new one.
+
+    Args:
+        sock: Connected ZMQ socket
+        old_addr: Address the socket is currently connected to
+        new_addr: Address to connect to
+
+    Returns:
+        True if the socket was moved, False if it should be recreated instead
+    """
+    try:
+        sock.disconnect(old_addr)
+        while True:
+            sock.recv(zmq.NOBLOCK)
+    except zmq.Again:
+        pass
+    except zmq.ZMQError:
+        return False
+    sock.connect(new_addr)
+    return True
+
+
 def reset_to_local_zmq(executor: any) -> None:
     """
     Reset executor to local ZMQ addresses.
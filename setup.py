@@ -41,8 +41,10 @@ setup(
         "click>=8.0.0",
         "pyzmq>=25.0.0",
         "psutil>=5.9.0",
-        "httpx>=0.24.0",
+        "httpx[http2]>=0.24.0",
         "cachetools>=5.3.0",
+        "orjson>=3.9.0",
+        "ijson>=3.2.0",
         "matplotlib>=3.5.0",
     ],
     entry_points={